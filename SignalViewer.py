@@ -1,19 +1,148 @@
-from turtle import color
-from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QLabel
 import numpy as np
-import pandas as pd
 import pyqtgraph as pg
-import random
-import pyqtgraph.exporters
+from frame_scheduler import default_scheduler
+from instrumentation import probe
+from signal_io import load_csv, signal_statistics
 
 
 # from Equalizer import Signal
 
+class SignalBuffer(object):
+    # Preallocated sample buffer, the capacity doubles when it is full so appending is amortized O(1).
+    # The filled part and its sample indices are exposed as views, never copied.
+    def __init__(self, capacity: int = 1024) -> None:
+        self._data = np.empty(max(1, capacity))
+        self._indices = np.arange(len(self._data), dtype=float)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    @property
+    def indices(self) -> np.ndarray:
+        # x values of the samples
+        return self._indices[:self._size]
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= len(self._data):
+            return
+        data = np.empty(capacity)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+        self._indices = np.arange(capacity, dtype=float)
+
+    def append(self, value) -> None:
+        if self._size == len(self._data):
+            self.reserve(2 * len(self._data))
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        size = self._size + len(values)
+        if size > len(self._data):
+            self.reserve(max(size, 2 * len(self._data)))
+        self._data[self._size:size] = values
+        self._size = size
+
+    def clear(self) -> None:
+        self._size = 0
+
+
+class MinMaxPyramid(object):
+    # Multi-resolution min/max envelope of a growing signal. Level 0 is the samples themselves and every bin of
+    # level k covers two bins of level k - 1 (2 ** k samples), appending only fills the bins the new samples complete.
+    def __init__(self, capacity: int = 1024) -> None:
+        self.samples = SignalBuffer(capacity)
+        self._mins = []  # level k at index k - 1
+        self._maxs = []
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def data(self) -> np.ndarray:
+        return self.samples.data
+
+    @property
+    def levels(self) -> int:
+        return 1 + len(self._mins)
+
+    def reserve(self, capacity: int) -> None:
+        self.samples.reserve(capacity)
+
+    def append(self, value) -> None:
+        self.samples.append(value)
+        self._update()
+
+    def extend(self, values) -> None:
+        self.samples.extend(values)
+        self._update()
+
+    def clear(self) -> None:
+        self.samples.clear()
+        self._mins = []
+        self._maxs = []
+
+    def _update(self) -> None:
+        parent_mins = parent_maxs = self.samples.data
+        level = 0
+        while len(parent_mins) >= 2:
+            if level == len(self._mins):
+                self._mins.append(SignalBuffer(len(parent_mins)))
+                self._maxs.append(SignalBuffer(len(parent_mins)))
+            mins, maxs = self._mins[level], self._maxs[level]
+            start, stop = len(mins), len(parent_mins) // 2
+            if start == stop:
+                # no new bin here, so none on the coarser levels either
+                break
+            mins.extend(np.minimum(parent_mins[2 * start:2 * stop:2], parent_mins[2 * start + 1:2 * stop:2]))
+            maxs.extend(np.maximum(parent_maxs[2 * start:2 * stop:2], parent_maxs[2 * start + 1:2 * stop:2]))
+            parent_mins, parent_maxs = mins.data, maxs.data
+            level += 1
+
+    def envelope(self, x_min: float, x_max: float, width: int):
+        # x, y to draw the samples in [x_min, x_max] on width pixels: the raw samples when they fit,
+        # otherwise the min/max of the coarsest level that still gives about one bin per pixel
+        first = max(0, int(np.floor(x_min)))
+        last = min(len(self), int(np.ceil(x_max)) + 1)
+        if last <= first:
+            return np.empty(0), np.empty(0)
+        level = 0
+        if last - first > 2 * width:
+            level = min(self.levels - 1, int(np.log2((last - first) / max(width, 1))))
+        if level == 0:
+            return self.samples.indices[first:last], self.data[first:last]
+
+        size = 1 << level
+        mins, maxs = self._mins[level - 1].data, self._maxs[level - 1].data
+        first_bin, last_bin = first // size, min(len(mins), -(-last // size))
+        count = last_bin - first_bin
+        # each bin is drawn as a vertical segment from its min to its max
+        x = np.empty(2 * count)
+        x[0::2] = x[1::2] = np.arange(first_bin, last_bin) * size + (size - 1) / 2
+        y = np.empty(2 * count)
+        y[0::2] = mins[first_bin:last_bin]
+        y[1::2] = maxs[first_bin:last_bin]
+        # samples after the last complete bin
+        tail = max(last_bin * size, first)
+        if tail < last:
+            x = np.concatenate((x, self.samples.indices[tail:last]))
+            y = np.concatenate((y, self.data[tail:last]))
+        return x, y
+
+
 class PlotSignal(object):
-    def __init__(self, data: list = [], color: tuple = (255, 255, 255)) -> None:
+    def __init__(self, data: list = [], color: tuple = (255, 255, 255), chunk_size: int = 4410) -> None:
         self.completed = False
-        self.plotted_data = []
         self.data = data
+        self.chunk_size = chunk_size  # samples added by each advance
+        self._plotted = SignalBuffer(np.size(data))  # holds the whole signal once played, never reallocated
         self.stop_drawing = False
         self.current_sample_index = 0
         self.current_sample = 0
@@ -24,6 +153,8 @@ class PlotSignal(object):
         self.bounds_paddings = [0.5, 10, 0.5, 5]  # top, right, bottom, left
         self._bounds = []  # top, right, bottom, left
         self.samples_number = len(self.data)
+        self._statistics = None
+        self._statistics_data = None  # the data the statistics were computed from
 
     @property
     def bounds(self):
@@ -38,22 +169,46 @@ class PlotSignal(object):
     def bounds(self, value):
         raise ValueError('this property is read only')
 
-    # update current sample, plot data and current sample index.
+    # the signal values: the value column of loaded (time, value) rows, the data itself otherwise
+    @property
+    def values(self):
+        data = np.asarray(self.data)
+        return data[:, 1] if data.ndim == 2 else data
+
+    # samples, mean, variance, std, min, max and rms of the whole signal, computed in one pass when the data changes
+    @property
+    def statistics(self):
+        if self._statistics_data is not self.data:
+            self._statistics = signal_statistics(self.values)
+            self._statistics_data = self.data
+        return self._statistics
+
+    @property
+    def mean(self):
+        return self.statistics['mean'][0]
+
+    @property
+    def variance(self):
+        return self.statistics['variance'][0]
+
+    @property
+    def std(self):
+        return self.statistics['std'][0]
+
+    # the samples played so far, a view of the buffer
+    @property
+    def plotted_data(self):
+        return self._plotted.data
+
+    # update current sample, plot data and current sample index (the number of chunks played).
     def advance(self):
         if not (self.stop_drawing or self.completed):
-            # self.current_sample = self.data[self.current_sample_index]
-            # self.plotted_data.append(self.current_sample)
-            # self.current_sample_index += 1
-            if 4410 * (self.current_sample_index + 1) < len(self.data):
-                self.current_sample = self.data[4410 * self.current_sample_index:4410 * (self.current_sample_index + 1)]
-                self.plotted_data = np.append(self.plotted_data, self.current_sample)
-                self.current_sample_index += 1
-            else:
-                self.current_sample = self.data[4410 * self.current_sample_index:]
-                self.plotted_data = np.append(self.plotted_data, self.current_sample)
-                self.current_sample_index += 1
-
-            if 4410 * (self.current_sample_index + 1) > len(self.data):
+            start = self.chunk_size * self.current_sample_index
+            self.current_sample = self.data[start:start + self.chunk_size]
+            self._plotted.extend(self.current_sample)
+            self.current_sample_index += 1
+
+            if start + self.chunk_size >= len(self.data):
                 self.completed = True
                 self.stop_drawing = True
                 self.is_active = False
@@ -65,11 +220,10 @@ class PlotSignal(object):
         self.stop_drawing = False
 
     def plot(self) -> None:  # update the signal graph
-        self.plot_data_item.clear()
-        self.plot_data_item.setData(self.plotted_data)
+        self.plot_data_item.setData(self._plotted.indices, self._plotted.data)
 
     def restart(self) -> None:
-        self.plotted_data = []
+        self._plotted.clear()
         self.completed = False
         self.stop_drawing = False
         self.current_sample = 0
@@ -77,14 +231,15 @@ class PlotSignal(object):
 
 
 class SignalViewerLogic(object):
-    def __init__(self, view: pg.PlotWidget) -> None:
+    def __init__(self, view: pg.PlotWidget, scheduler=None) -> None:
 
         self.view = view
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.draw)
+        # draw and render_stream run from the frame scheduler, only while there is something to draw
+        self.scheduler = scheduler if scheduler is not None else default_scheduler()
         self.signal = None  # storing loaded signals from the file
         self._rate = 10  # samples per second
-        self.timer.start(int(1000 / self._rate))  # The delay that the draw method takes for each call
+        self.draw_subscription = self.scheduler.subscribe(self.draw, 1000 / self._rate)
+        self.render_subscription = self.scheduler.subscribe(self.render_stream)
         self.view_width = 1000  # initial width
         self.view_height = 10  # initial height
         self._xRange = [0, self.view_width]
@@ -102,6 +257,13 @@ class SignalViewerLogic(object):
         self.display_axis_labels = True
         self.view_limits = []
         self.apply_limits = False
+        # streamed signal drawn through its min/max pyramid, see set_stream
+        self.stream = None
+        self.stream_curve = None
+        self._stream_key = None
+        self.view.getViewBox().sigXRangeChanged.connect(lambda *_: self.request_render())
+        self.view.getViewBox().sigResized.connect(lambda *_: self.request_render())
+        self.overlay = None  # QLabel of set_overlay
 
     @property
     def background_color(self):
@@ -160,16 +322,23 @@ class SignalViewerLogic(object):
         self._display_grid = value
         self.view.showGrid(x=self.display_grid, y=self.display_grid)
 
+    # samples per second of the drawn signals, the bottom axis shows seconds instead of sample indices
+    @property
+    def sample_rate(self):
+        return 1 / self.view.getAxis('bottom').scale
+
+    @sample_rate.setter
+    def sample_rate(self, value):
+        self.view.getAxis('bottom').setScale(1 / value)
+
     @property
     def rate(self):
         return self._rate
 
     @rate.setter
     def rate(self, value):
-        self.timer.stop()
         self._rate = value
-        duration = 1000 / self._rate
-        self.timer.start(int(duration))
+        self.draw_subscription.interval = 1000 / self._rate
 
     @property
     def yRange(self) -> list:
@@ -193,7 +362,7 @@ class SignalViewerLogic(object):
         self.view.setTitle(title)
 
     def load_dataset(self, filename: str) -> None:
-        data = pd.read_csv(filename).to_numpy().tolist()
+        data = load_csv(filename)
         self.signal = PlotSignal(data=data)
 
     # deprecated methods
@@ -233,6 +402,7 @@ class SignalViewerLogic(object):
     # apply the action on the active signals
     def play(self):
         self.signal.resume()
+        self.draw_subscription.start()
 
     # apply the action on the active signals
     def pause(self):
@@ -241,10 +411,11 @@ class SignalViewerLogic(object):
     # apply the action on the active signals
     def replay(self):
         self.signal.restart()
+        self.draw_subscription.start()
 
     # apply the action on the active signals
     def set_signal_title(self, signal: PlotSignal, text: str):
-        pos_x = int(random.random() * 100)
+        pos_x = np.random.randint(100)
         pos_y = signal.data[pos_x]
         title = pg.TextItem(text=text, color=signal.color)
         title.setPos(pos_x, pos_y)
@@ -252,6 +423,7 @@ class SignalViewerLogic(object):
 
     # apply the action on the active signals
     def exportImage(self, name, format=None):
+        import pyqtgraph.exporters  # only needed when exporting
         exporter = pg.exporters.ImageExporter(self.view.plotItem)
         if format is None:
             exporter.export(f'{name}.png')
@@ -259,70 +431,11 @@ class SignalViewerLogic(object):
             exporter.export(f'{name}.{format}')
 
     def exportPDF(self, name):
-
-        # create document
-        document = ap.Document()
-
-        # Insert a empty page in a PDF
-        page = document.pages.add()
-
-        # Add Image
-        self.exportImage(name)  # 20, 730, 120, 830
-        page.add_image(f"{name}.png", ap.Rectangle(20, 870, 550, 570, True))
-
-        # Add Header
-        header = ap.text.TextFragment("Details about the Signals")
-        header.text_state.font = ap.text.FontRepository.find_font("Arial")
-        header.text_state.font_size = 24
-        header.horizontal_alignment = ap.HorizontalAlignment.CENTER
-        # header.position = ap.text.Position(130, 720)
-        header.position = ap.text.Position(120, 550)
-        page.paragraphs.add(header)
-
-        # Add table
-        table = ap.Table()
-        table.column_widths = "80"
-        table.border = ap.BorderInfo(ap.BorderSide.BOX, 1.0, ap.Color.dark_slate_gray)
-        table.default_cell_border = ap.BorderInfo(ap.BorderSide.BOX, 0.5, ap.Color.black)
-        table.default_cell_padding = ap.MarginInfo(2, 2, 2, 2)
-        table.margin.bottom = 10
-        table.default_cell_text_state.font = ap.text.FontRepository.find_font("Helvetica")
-        headerRow = table.rows.add()
-        headerRow.cells.add("Signal Name")
-        headerRow.cells.add("Number of Samples")
-        headerRow.cells.add("Mean")
-        headerRow.cells.add("Variance")
-        headerRow.cells.add("Standard Deviation")
-
-        for i in range(headerRow.cells.count):
-            headerRow.cells[i].background_color = ap.Color.gray
-            headerRow.cells[i].default_cell_text_state.foreground_color = ap.Color.white_smoke
-
-        for sig in self.plotted_signals:
-            dataRow = table.rows.add()
-            dataRow.cells.add(str(sig.title.toPlainText()))
-            dataRow.cells.add(str(sig.samples_number))
-            dataRow.cells.add(str(sig.mean))
-            dataRow.cells.add(str(sig.variance))
-            dataRow.cells.add(str(sig.std))
-        page.paragraphs.add(table)
-
-        # Add watermark
-        artifact = ap.WatermarkArtifact()
-        ts = ap.text.TextState()
-        ts.font_size = 75
-        ts.foreground_color = ap.Color.blue
-        ts.font = ap.text.FontRepository.find_font("Courier")
-        artifact.set_text_and_state("      ABDULLAH OMRAN", ts)
-        artifact.artifact_horizontal_alignment = ap.HorizontalAlignment.CENTER
-        # artifact.artifact_vertical_alignment = ap.VerticalAlignment.CENTER
-
-        artifact.rotation = 45
-        artifact.opacity = 0.2
-        artifact.is_background = True
-        document.pages[1].artifacts.append(artifact)
-        # Save document
-        document.save(f'{name}.pdf')
+        # one page with the view and the statistics of the signal, rendered offscreen like python -m report
+        import report  # only needed when exporting, it pulls in the batch filtering
+        title = self.signal.title.toPlainText() if hasattr(self.signal, 'title') else self.view.plotItem.titleLabel.text
+        rows = report.statistics_rows([title], self.signal.statistics) if self.signal is not None else []
+        report.write_report(f'{name}.pdf', title or name, [report.render_plot(self.view)], rows)
 
     # apply the action on the active signals
     # draw active signals
@@ -334,6 +447,58 @@ class SignalViewerLogic(object):
                     self.horizontal_shift(1)
                 self.signal.advance()
                 self.signal.plot()
+        if self.signal is None or self.signal.stop_drawing or self.signal.completed:
+            self.draw_subscription.stop()
+
+    def set_stream(self, pyramid: MinMaxPyramid, curve: pg.PlotDataItem = None) -> None:
+        self.stream = pyramid
+        self.stream_curve = curve if curve is not None else pg.PlotDataItem()
+        self._stream_key = None
+        self.render_stream()
+
+    # monospaced text over the top left corner of the view, None hides it
+    def set_overlay(self, text) -> None:
+        if self.overlay is None:
+            if text is None:
+                return
+            self.overlay = QLabel(self.view)
+            self.overlay.setStyleSheet("color: #E0E0E0; background-color: rgba(0, 0, 0, 160); padding: 4px;"
+                                       "font-family: monospace; font-size: 10px;")
+            self.overlay.move(60, 30)
+        self.overlay.setVisible(text is not None)
+        if text is not None:
+            self.overlay.setText(text)
+            self.overlay.adjustSize()
+            self.overlay.raise_()
+
+    # render_stream on the next frame, however many times the range changes until then
+    def request_render(self) -> None:
+        if self.stream is not None:
+            self.render_subscription.start()
+
+    # Draw the streamed signal at the level of detail of the current x range and pixel width,
+    # so the cost depends on the width of the view rather than on the length of the signal
+    def render_stream(self) -> None:
+        self.render_subscription.stop()
+        if self.stream is None:
+            return
+        if self.stream_curve not in self.view.listDataItems():
+            self.view.addItem(self.stream_curve)
+            self._stream_key = None
+        view_box = self.view.getViewBox()
+        width = int(view_box.width()) or self.view_width
+        if view_box.autoRangeEnabled()[0]:
+            # the range follows the data, draw all of it so it can grow
+            x_min, x_max = 0, len(self.stream)
+        else:
+            x_min, x_max = self.xRange
+        key = (len(self.stream), int(x_min), int(x_max), width)
+        if key == self._stream_key:
+            return
+        self._stream_key = key
+        with probe.stage('render.signal'):
+            x, y = self.stream.envelope(x_min, x_max, width)
+            self.stream_curve.setData(x, y)
 
     # add signal to the plotted signal and active signals and start drawing it
     def add_signal(self, color=(255, 255, 255)):
@@ -342,6 +507,7 @@ class SignalViewerLogic(object):
         pen = pg.mkPen(self.signal.color, width=3)
         self.signal.plot_data_item.setPen(pen)
         self.view.addItem(self.signal.plot_data_item)
+        self.draw_subscription.start()
         # related to view limits if it is enabled
         #  update them so that the limits are applicable on the new signal
         if self.apply_limits == True:
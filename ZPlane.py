@@ -4,20 +4,32 @@ from itertools import chain
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QCheckBox, QFileDialog
 from PyQt5.QtCore import Qt
-from scipy.signal import freqz_zpk, lfilter
 import numpy as np
-import matplotlib.pyplot as plt
+from frame_scheduler import default_scheduler
+from frequency_response import FrequencyResponse, ResponseWorker
+from instrumentation import probe
 
 
 class ZPlaneSignalFilter(QWidget):
-    def __init__(self, unit_circle_w, mag_res_w, phase_res_w, checkbox):
+    def __init__(self, unit_circle_w, mag_res_w, phase_res_w, group_delay_res_w, checkbox, scheduler=None):
         super().__init__()
         self.delete_flag = False  # Flag to control deletion or creation
         self.conjugate_flag = False  # Flag to determine if conjugate plotting is enabled
         self.unit_circle_w = unit_circle_w
         self.mag_res_w = mag_res_w
         self.phase_res_w = phase_res_w
+        self.group_delay_res_w = group_delay_res_w
         self.reflect_checkbox = checkbox
+        self.design_version = 0  # Bumped on every change of the zeros/poles, lets consumers cache derived data
+        self.response = FrequencyResponse()  # cached per root factors, only the moved roots are recomputed
+        # While dragging the response is computed off the GUI thread and shown at most once per frame
+        self.response_worker = ResponseWorker()
+        self.scheduler = scheduler if scheduler is not None else default_scheduler()
+        self.response_subscription = self.scheduler.subscribe(self.show_worker_response)
+        self.shown_response_version = -1
+        self.mag_curve = pg.PlotDataItem()
+        self.phase_curve = pg.PlotDataItem()
+        self.group_delay_curve = pg.PlotDataItem()
         self.init_ui()
 
     def init_ui(self):
@@ -61,6 +73,19 @@ class ZPlaneSignalFilter(QWidget):
         self.t = None
         self.x = None
 
+    def design_changed(self):
+        # Invalidate everything derived from the zeros/poles (e.g. the OnlineFilter coefficients)
+        self.design_version += 1
+
+    @staticmethod
+    def find_conjugate_item(pairs, item):
+        for pair in pairs:
+            if id(pair[0]) == id(item):
+                return pair[1]
+            elif id(pair[1]) == id(item):
+                return pair[0]
+        return None
+
     def zero_moved(self, zero_addr, e):
         for z in self.list_pairs_zeros:
             if id(z[0]) == zero_addr:
@@ -77,13 +102,22 @@ class ZPlaneSignalFilter(QWidget):
 
     def update_zero_position(self, zero_item, e):
         index = self.zero_items.index(zero_item)
-        self.zeros[index] = (e.pos().x(), -1 * e.pos().y())
-        self.plot_frequency_response()
+        self.zeros[index] = (e.pos().x(), e.pos().y())
+        # keep the reflected zero in step, its item was already moved by zero_moved
+        zero_conj = self.find_conjugate_item(self.list_pairs_zeros, zero_item)
+        if zero_conj is not None:
+            self.zerosf[self.zero_itemsf.index(zero_conj)] = (e.pos().x(), -1 * e.pos().y())
+        self.design_changed()
+        self.request_frequency_response()
 
     def update_pole_position(self, pole_item, e):
         index = self.pole_items.index(pole_item)
-        self.poles[index] = (e.pos().x(), -1 * e.pos().y())
-        self.plot_frequency_response()
+        self.poles[index] = (e.pos().x(), e.pos().y())
+        pole_conj = self.find_conjugate_item(self.list_pairs_poles, pole_item)
+        if pole_conj is not None:
+            self.polesf[self.pole_itemsf.index(pole_conj)] = (e.pos().x(), -1 * e.pos().y())
+        self.design_changed()
+        self.request_frequency_response()
 
     def on_click(self, event):
         pos = self.plot_widget.getViewBox().mapSceneToView(event.scenePos())
@@ -106,37 +140,26 @@ class ZPlaneSignalFilter(QWidget):
             elif event.button() == 2:  # Right mouse button for zeros
                 self.zeros.append((pos.x(), pos.y()))
                 self.plot_zero(pos.x(), pos.y())
+        self.design_changed()
         self.plot_frequency_response()
 
     def clear_zero_or_pole(self, event):
         if event.button() == Qt.MiddleButton:
             pos = self.plot_widget.getViewBox().mapSceneToView(event.scenePos())
 
-            def find_nearest(coords_list, target):
-                # Calculate the distances between each coordinate in the list and the target
-                distances = [np.linalg.norm(np.array(coord) - np.array(target)) for coord in coords_list]
-                # Find the index of the coordinate with the minimum distance
-                min_index = np.argmin(distances)
-                return min_index
-
             # Check if the pulley click is near any zero or pole
             for zero_item in self.zero_items:
                 if np.linalg.norm(np.array(zero_item.pos()) - np.array([pos.x(), pos.y()])) < 0.1:
                     self.plot_widget.removeItem(zero_item)
-                    zero_conj = None
-                    for z in self.list_pairs_zeros:
-                        if id(z[0]) == id(zero_item):
-                            zero_conj = z[1]
-                            break
-                        elif id(z[1]) == id(zero_item):
-                            zero_conj = z[0]
-                            break
+                    zero_conj = self.find_conjugate_item(self.list_pairs_zeros, zero_item)
                     if zero_conj is not None:
                         self.plot_widget.removeItem(zero_conj)
-                        index_conj = find_nearest(self.zerosf, (pos.x(), -pos.y()))
+                        index_conj = self.zero_itemsf.index(zero_conj)
                         self.zero_itemsf.remove(zero_conj)
                         self.zerosf.pop(index_conj)
-                    index = find_nearest(self.zeros, (pos.x(), pos.y()))
+                        self.list_pairs_zeros = [z for z in self.list_pairs_zeros if id(z[0]) != id(zero_item)]
+                    # the items and the coordinates lists are kept in the same order
+                    index = self.zero_items.index(zero_item)
 
                     self.zero_items.remove(zero_item)
 
@@ -148,26 +171,21 @@ class ZPlaneSignalFilter(QWidget):
                 for pole_item in self.pole_items:
                     if np.linalg.norm(np.array(pole_item.pos()) - np.array([pos.x(), pos.y()])) < 0.1:
                         self.plot_widget.removeItem(pole_item)
-                        pole_conj = None
-                        for z in self.list_pairs_poles:
-                            if id(z[0]) == id(pole_item):
-                                pole_conj = z[1]
-                                break
-                            elif id(z[1]) == id(pole_item):
-                                pole_conj = z[0]
-                                break
+                        pole_conj = self.find_conjugate_item(self.list_pairs_poles, pole_item)
                         if pole_conj is not None:
                             self.plot_widget.removeItem(pole_conj)
-                            index_conj = find_nearest(self.polesf, (pos.x(), -pos.y()))
+                            index_conj = self.pole_itemsf.index(pole_conj)
                             self.pole_itemsf.remove(pole_conj)
                             self.polesf.pop(index_conj)
-                        index = find_nearest(self.poles, (pos.x(), pos.y()))
+                            self.list_pairs_poles = [p for p in self.list_pairs_poles if id(p[0]) != id(pole_item)]
+                        index = self.pole_items.index(pole_item)
                         self.pole_items.remove(pole_item)
                         self.poles.pop(index)
                         break
             except ValueError:
                 print(f"Coordinates {pos.x(), pos.y()} not found in the list of poles.")
 
+            self.design_changed()
             self.plot_frequency_response()
 
     def clear_zeros_and_poles(self):
@@ -179,6 +197,7 @@ class ZPlaneSignalFilter(QWidget):
         self.zeros = []
         self.zerosf = []
         self.zero_itemsf = []
+        self.list_pairs_zeros = []
 
         for pole_item in self.pole_items:
             self.plot_widget.removeItem(pole_item)
@@ -188,8 +207,11 @@ class ZPlaneSignalFilter(QWidget):
         self.poles = []
         self.polesf = []
         self.pole_itemsf = []
+        self.list_pairs_poles = []
+        self.design_changed()
         self.mag_res_w.clear()
         self.phase_res_w.clear()
+        self.group_delay_res_w.clear()
 
     def clear_poles(self):
         for pole_item in self.pole_items:
@@ -200,6 +222,8 @@ class ZPlaneSignalFilter(QWidget):
         self.poles = []
         self.polesf = []
         self.pole_itemsf = []
+        self.list_pairs_poles = []
+        self.design_changed()
         self.plot_frequency_response()
 
     def clear_zeros(self):
@@ -211,6 +235,8 @@ class ZPlaneSignalFilter(QWidget):
         self.zeros = []
         self.zerosf = []
         self.zero_itemsf = []
+        self.list_pairs_zeros = []
+        self.design_changed()
         self.plot_frequency_response()
 
     def plot_pole(self, x, y):
@@ -228,7 +254,7 @@ class ZPlaneSignalFilter(QWidget):
                 pos=[x, reflected_y], size=20, symbol='x', pen='g', brush='g', movable=False)
             self.pole_itemsf.append(target_reflected_pole)
             self.plot_widget.addItem(target_reflected_pole)
-            self.list_pairs_poles = [(target_pole, target_reflected_pole)]
+            self.list_pairs_poles.append((target_pole, target_reflected_pole))
 
     def plot_zero(self, x, y):
         target_zero = pg.TargetItem(pos=[x, y], size=20, symbol='o', pen='w', brush='w', movable=True)
@@ -245,34 +271,58 @@ class ZPlaneSignalFilter(QWidget):
                 pos=[x, reflected_y], size=20, symbol='o', pen='g', brush='g', movable=False)
             self.zero_itemsf.append(target_reflected_zero)
             self.plot_widget.addItem(target_reflected_zero)
-            self.list_pairs_zeros = [(target_zero, target_reflected_zero)]
+            self.list_pairs_zeros.append((target_zero, target_reflected_zero))
+
+    def design_roots(self):
+        # the reflected conjugates are part of the design the OnlineFilter applies
+        zeros = [complex(z[0], z[1]) for z in self.zeros + self.zerosf]
+        poles = [complex(p[0], p[1]) for p in self.poles + self.polesf]
+        return zeros, poles
 
     def plot_frequency_response(self):
-        zeros = [complex(z[0], z[1]) for z in self.zeros]
-        poles = [complex(p[0], p[1]) for p in self.poles]
+        zeros, poles = self.design_roots()
         return self.plot_response(zeros, poles)
 
-    def plot_response(self, zeros, poles):
-        # Generate frequencies for the frequency range
-        frequencies, response = freqz_zpk(zeros, poles, k=1)
-
-        # Plot the magnitude response
-        # plt.figure(figsize=(10, 5))
-        # plt.subplot(2, 1, 1)
-        magnitude = np.abs(response)
-        if np.any(np.iscomplex(magnitude)):
-            magnitude = np.abs(response.astype(float))  # Cast to float to remove complex part
-        # plt.plot(frequencies, magnitude)
-        plot = pg.PlotDataItem(frequencies, magnitude)
-        self.mag_res_w.clear()
-        self.mag_res_w.addItem(plot)
+    def request_frequency_response(self):
+        # asynchronous plot_frequency_response for the drag events
+        zeros, poles = self.design_roots()
+        self.response_worker.request(self.design_version, zeros, poles)
+        self.response_subscription.start()
+
+    def show_worker_response(self):
+        result = self.response_worker.take_result()
+        if result is not None:
+            version, frequencies, magnitude, phase, group_delay = result
+            # a synchronous plot of a newer design may already be shown
+            if version > self.shown_response_version:
+                self.show_response(version, frequencies, magnitude, phase, group_delay)
+        elif not self.response_worker.busy:
+            self.response_subscription.stop()
+
+    @staticmethod
+    def show_curve(widget, curve, x, y):
+        # The response replaces whatever else was plotted (e.g. a corrected phase)
+        with probe.stage('render.response'):
+            if widget.listDataItems() != [curve]:
+                widget.clear()
+                widget.addItem(curve)
+            curve.setData(x, y)
+
+    def show_response(self, version, frequencies, magnitude, phase, group_delay):
+        self.show_curve(self.mag_res_w, self.mag_curve, frequencies, magnitude)
+        self.show_curve(self.phase_res_w, self.phase_curve, frequencies, phase)
+        self.show_curve(self.group_delay_res_w, self.group_delay_curve, frequencies, group_delay)
+        self.shown_response_version = version
 
-        phase = np.angle(response)
-        if np.any(np.iscomplex(phase)):
-            phase = np.angle(response.astype(float))  # Cast to float to remove complex part
-        plot = pg.PlotDataItem(frequencies, phase)
-        self.phase_res_w.clear()
-        self.phase_res_w.addItem(plot)
+    def plot_response(self, zeros, poles):
+        # Same magnitude as freqz_zpk(zeros, poles, k=1) and phase as freqz in powers of z^-1, like the all-pass
+        # phase it is corrected with, only the roots that moved since the last call are recomputed
+        with probe.stage('response'):
+            self.response.set_roots(zeros, poles)
+            frequencies = self.response.frequencies
+            phase = self.response.phase
+        self.show_response(self.design_version, frequencies, self.response.magnitude, phase,
+                           self.response.group_delay)
         return frequencies, phase
 
     def load_signal_from_file(self):
@@ -1,43 +1,44 @@
-import random
+from functools import lru_cache
 
 import numpy as np
 import pyqtgraph as pg
-from scipy.signal import freqz, tf2zpk
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 
 
 class AllPassFilterFeature(object):
-    def __init__(self, filters=None, phase_w=None, poles_zeros_w=None):
+    def __init__(self, filters=None, phase_w=None, poles_zeros_w=None, worN=512):
+        self.worN = worN  # frequencies of the phase and group delay, the freqz grid of the z-plane response
         self.phase_scene = phase_w if phase_w is not None else pg.PlotWidget()
         self.mag_scene = pg.PlotWidget()
         self.zeros_poles_scene = poles_zeros_w if poles_zeros_w is not None else pg.PlotWidget()
         self.all_pass_filters = filters if filters is not None else []
         self.phase_response = 0
+        self.group_delay = 0
 
     def get_scene(self):
         self.phase_scene.clear()
         self.mag_scene.clear()
         self.zeros_poles_scene.clear()
-        phase_response = []
-        freqs = 0
         for filter in self.all_pass_filters:
-            mag, _ = filter.get_frequency_response_plots()
-            freqs, phase = filter.calculate_phase_response()
-            poles, zeros, circle = filter.get_zeros_poles_plot()
-            phase_response.append(phase)
+            mag, _ = filter.freq_response_plot
+            poles, zeros, circle = filter.zeros_poles_plot
             self.mag_scene.addItem(mag)
             self.zeros_poles_scene.addItem(poles)
             self.zeros_poles_scene.addItem(zeros)
             self.zeros_poles_scene.addItem(circle)
-            self.zeros_poles_scene.setBackground((25, 35, 45))
-            self.x_axis = pg.InfiniteLine(pos=0, angle=0, pen=(255, 0, 0), movable=False)
-            self.y_axis = pg.InfiniteLine(pos=0, angle=90, pen=(0, 255, 0), movable=False)
-            self.zeros_poles_scene.addItem(self.x_axis)
-            self.zeros_poles_scene.addItem(self.y_axis)
-        phase_response = np.sum(np.array(phase_response), axis=0)
-        self.phase_response = phase_response
-        phase_plot = pg.PlotDataItem(0.5 * freqs / np.pi, phase_response)
+        # one pair of axes whatever the number of stages
+        self.zeros_poles_scene.setBackground((25, 35, 45))
+        self.x_axis = pg.InfiniteLine(pos=0, angle=0, pen=(255, 0, 0), movable=False)
+        self.y_axis = pg.InfiniteLine(pos=0, angle=90, pen=(0, 255, 0), movable=False)
+        self.zeros_poles_scene.addItem(self.x_axis)
+        self.zeros_poles_scene.addItem(self.y_axis)
+        # the whole cascade in one broadcast, the stage phases wrapped like np.angle of their responses
+        freqs = np.linspace(0, np.pi, self.worN, endpoint=False)
+        coefficients = [filter.a for filter in self.all_pass_filters]
+        self.phase_response = all_pass_cascade_phase(coefficients, freqs, wrap_stages=True)
+        self.group_delay = all_pass_cascade_group_delay(coefficients, freqs)
+        phase_plot = pg.PlotDataItem(0.5 * freqs / np.pi, self.phase_response)
         self.phase_scene.addItem(phase_plot)
 
         return self.phase_scene, self.mag_scene, self.zeros_poles_scene
@@ -49,25 +50,90 @@ class AllPassFilterFeature(object):
         return pg.PlotDataItem(freqs, corrected_phase)
 
 
+# Responses and roots of the all-pass stages, shared by every AllPassFilter (GUI or headless) of the process:
+# showing or applying a library of stages again costs no freqz/tf2zpk work
+ALL_PASS_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=ALL_PASS_CACHE_SIZE)
+def all_pass_response(a, worN=512):
+    # frequencies (rad/sample) and complex response of (z^-1 - conj(a)) / (1 - a z^-1), read only
+    from scipy.signal import freqz  # takes about a second to import, only imported where it is used
+    frequencies, response = freqz([-np.conjugate(a), 1], [1, -a], worN=worN)
+    frequencies.flags.writeable = False
+    response.flags.writeable = False
+    return frequencies, response
+
+
+@lru_cache(maxsize=ALL_PASS_CACHE_SIZE)
+def all_pass_roots(a):
+    # zeros, poles (read only) and gain of the stage
+    from scipy.signal import tf2zpk
+    zeros, poles, gain = tf2zpk([-np.conjugate(a), 1], [1, -a])
+    zeros.flags.writeable = False
+    poles.flags.writeable = False
+    return zeros, poles, gain
+
+
+def _stage_terms(coefficients, frequencies):
+    # (..., N, 1) radii and angles of the coefficients against (W,) frequencies, broadcast to (..., N, W)
+    a = np.asarray(coefficients, dtype=complex)[..., np.newaxis]
+    return np.abs(a), np.asarray(frequencies, dtype=float) - np.angle(a)
+
+
+def all_pass_cascade_phase(coefficients, frequencies, wrap_stages=False):
+    # Phase of a cascade of first order stages (z^-1 - conj(a)) / (1 - a z^-1) in closed form, without freqz:
+    # with a = r e^(j theta) every stage is -w - 2 atan2(r sin(w - theta), 1 - r cos(w - theta)).
+    # coefficients (..., N) for N stages, e.g. K candidate cascades as (K, N), give the (..., W) summed phase.
+    # wrap_stages wraps every stage to (-pi, pi] before the sum, like adding np.angle of the stage responses.
+    r, u = _stage_terms(coefficients, frequencies)
+    phase = -np.asarray(frequencies, dtype=float) - 2 * np.arctan2(r * np.sin(u), 1 - r * np.cos(u))
+    if wrap_stages:
+        phase = np.pi - (np.pi - phase) % (2 * np.pi)
+    return phase.sum(axis=-2)
+
+
+def all_pass_cascade_group_delay(coefficients, frequencies):
+    # group delay (samples) of the cascade, every stage is (1 - r^2) / (1 - 2 r cos(w - theta) + r^2)
+    r, u = _stage_terms(coefficients, frequencies)
+    return ((1 - r ** 2) / (1 - 2 * r * np.cos(u) + r ** 2)).sum(axis=-2)
+
+
+_CIRCLE_ANGLES = np.linspace(0, 2 * np.pi, 100)
+
+
 class AllPassFilter:
-    def __init__(self, a):
+    def __init__(self, a, worN=512):
         self.a = a
-        self.zeros, self.poles, self.gain = tf2zpk([-np.conjugate(a), 1], [1, -a])
-        self.freq_response_plot = self.get_frequency_response_plots()
-        self.zeros_poles_plot = self.get_zeros_poles_plot()
+        self.worN = worN
+        self.zeros, self.poles, self.gain = all_pass_roots(a)
+        # the plot items are only built when a scene asks for them
+        self._freq_response_plot = None
+        self._zeros_poles_plot = None
         self.frequencies, self.phase_values = self.calculate_phase_response()
 
+    @property
+    def freq_response_plot(self):
+        if self._freq_response_plot is None:
+            self._freq_response_plot = self.get_frequency_response_plots()
+        return self._freq_response_plot
+
+    @property
+    def zeros_poles_plot(self):
+        if self._zeros_poles_plot is None:
+            self._zeros_poles_plot = self.get_zeros_poles_plot()
+        return self._zeros_poles_plot
+
     def transfer_function(self, z):
         return (z ** -1 - self.a) / (1 - self.a * z ** -1)
 
     def get_freq_response(self):
         # Frequency response
-        frequencies, response = freqz([-np.conjugate(self.a), 1], [1, -self.a], worN=512)
-        return frequencies, response
+        return all_pass_response(self.a, self.worN)
 
     def get_frequency_response_plots(self):
         # Frequency response
-        frequencies, response = freqz([-np.conjugate(self.a), 1], [1, -self.a], worN=512)
+        frequencies, response = all_pass_response(self.a, self.worN)
 
         # Plot magnitude response
 
@@ -87,9 +153,8 @@ class AllPassFilter:
         zeros_plot = pg.PlotDataItem(self.zeros.real, self.zeros.imag, size=15, symbol='o', pen='g', brush='g')
         poles_plot = pg.PlotDataItem(self.poles.real, self.poles.imag, size=15, symbol='x', pen='w', brush='w')
         # Plot unit circle
-        theta = np.linspace(0, 2 * np.pi, 100)
-        x_circle = np.cos(theta)
-        y_circle = np.sin(theta)
+        x_circle = np.cos(_CIRCLE_ANGLES)
+        y_circle = np.sin(_CIRCLE_ANGLES)
         # win.plot(x_circle, y_circle, pen=pg.mkPen('g', width=1.5), name='Unit Circle')
         circle = pg.PlotDataItem(x_circle, y_circle, pen=pg.mkPen((0, 0, 255), width=1.5))
 
@@ -97,16 +162,104 @@ class AllPassFilter:
 
     def calculate_phase_response(self):
         # Calculate phase response at different frequencies
-        frequencies, response = freqz([-np.conjugate(self.a), 1], [1, -self.a], worN=512)
+        frequencies, response = all_pass_response(self.a, self.worN)
         phase_values = np.angle(response)
         return 0.5 * frequencies / np.pi, phase_values
 
 
+class HistoryBuffer(object):
+    # Fixed size history of the latest values, newest first. The values are written twice into a double length
+    # array so the whole history is always a contiguous view and pushing a value never allocates.
+    def __init__(self, size=0):
+        self._size = 0
+        self._start = 0
+        self._buffer = np.zeros(0)
+        self.resize(size)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def values(self):
+        return self._buffer[self._start:self._start + self._size]
+
+    def push(self, value):
+        if self._size == 0:
+            return
+        self._start = self._start - 1 if self._start > 0 else self._size - 1
+        self._buffer[self._start] = value
+        self._buffer[self._start + self._size] = value
+
+    def extend(self, values):
+        # values are given oldest first, like a block of samples
+        if self._size == 0:
+            return
+        values = np.asarray(values, dtype=float)[::-1]
+        n = min(len(values), self._size)
+        history = np.concatenate((values[:n], self.values[:self._size - n]))
+        self._buffer[:self._size] = history
+        self._buffer[self._size:] = history
+        self._start = 0
+
+    def resize(self, size):
+        # keep the newest values, older positions are zero padded
+        values = self.values
+        n = min(size, len(values))
+        buffer = np.zeros(2 * size)
+        buffer[:n] = values[:n]
+        buffer[size:size + n] = values[:n]
+        self._buffer = buffer
+        self._size = size
+        self._start = 0
+
+    def clear(self):
+        self._buffer[:] = 0
+        self._start = 0
+
+
+CONJUGATE_TOLERANCE = 1e-9  # relative distance under which two roots count as conjugates
+
+
+def conjugate_paired(roots, tolerance=CONJUGATE_TOLERANCE):
+    # True when every complex root has its conjugate among the roots, i.e. prod(z - r) has real coefficients.
+    # Real roots pair with themselves.
+    roots = np.asarray(roots, dtype=complex)
+    if len(roots) == 0:
+        return True
+    scale = tolerance * max(1.0, np.abs(roots).max())
+    upper = list(roots[roots.imag > scale])
+    lower = list(np.conj(roots[roots.imag < -scale]))
+    if len(upper) != len(lower):
+        return False
+    for root in upper:
+        distances = np.abs(np.array(lower) - root)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > scale:
+            return False
+        del lower[nearest]
+    return True
+
+
+def zeros_poles_to_sos(zeros, poles, numerator, denominator):
+    # Pair the conjugate roots into real second order sections
+    from scipy.signal import tf2sos, zpk2sos
+    try:
+        return zpk2sos(zeros, poles, 1)
+    except ValueError:
+        # Unpaired complex roots (e.g. complex all-pass stages) have no real factorization, fall back to the
+        # sections of the real parts of the expanded polynomials which is what the direct form filters with
+        return tf2sos(np.real(numerator), np.real(denominator))
+
+
 class OnlineFilter(object):
-    def __init__(self, signal, filter, all_pass_filters=None):
+    BACKENDS = ('direct', 'sos')
+
+    def __init__(self, signal, filter, all_pass_filters=None, backend='direct'):
         self._signal = signal
         self._filter = filter
         self._all_pass_filters = all_pass_filters if all_pass_filters is not None else []
+        self._all_pass_version = 0
+        self._design_version = None  # (filter, all-pass) versions the cached coefficients were built for
         self._current_sample_index = -1
         self._current_sample = None
         self._current_filtered_sample = 0
@@ -117,9 +270,18 @@ class OnlineFilter(object):
         self._npoles = 0
         self._H_numerator_poly = []
         self._H_denominator_poly = []
+        self._is_real = True  # conjugate paired roots, real float64 coefficients
         self._is_consumed = True if len(self.signal) == 0 else False
-        self._inputs = []
-        self._outputs = []
+        self._inputs = HistoryBuffer()  # x[n], x[n-1], ..., x[n-nzeros]
+        self._outputs = HistoryBuffer()  # y[n-1], ..., y[n-npoles]
+        self._feedback_poly = np.array([])
+        self._zi = None  # lfilter state carried between consecutive process_block calls
+        self._zi_version = None
+        self._sos = None
+        self._sos_zi = None  # sosfilt state of the cascade, one row per section
+        self._sos_zi_version = None
+        self._backend = None
+        self.backend = backend
 
     @property
     def is_consumed(self):
@@ -159,6 +321,17 @@ class OnlineFilter(object):
     @all_pass_filters.setter
     def all_pass_filters(self, value):
         self._all_pass_filters = value
+        self._all_pass_version += 1
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @backend.setter
+    def backend(self, value):
+        if value not in self.BACKENDS:
+            raise ValueError(f"unknown filtering backend {value!r}, expected one of {self.BACKENDS}")
+        self._backend = value
 
     @property
     def current_sample_index(self):
@@ -194,16 +367,58 @@ class OnlineFilter(object):
         self._filtered_signal = value
 
     @property
-    def zeros(self):
+    def design_version(self):
+        # The coefficients depend on both the z-plane design and the enabled all-pass stages
+        return self.filter.design_version, self._all_pass_version
+
+    def _update_design(self):
+        # Rebuild the roots and the difference equation coefficients only when the design has changed
+        design_version = self.design_version
+        if design_version == self._design_version:
+            return
         all_pass_zeros = np.array([])
-        filter_zeros = np.array([])
+        all_pass_poles = np.array([])
         for filter in self.all_pass_filters:
             all_pass_zeros = np.append(all_pass_zeros, filter.get_zeros())
-        filter_zeros = self.filter.zeros + self.filter.zerosf
-        filter_zeros = np.array(filter_zeros)
+            all_pass_poles = np.append(all_pass_poles, filter.get_poles())
+        filter_zeros = np.array(self.filter.zeros + self.filter.zerosf)
         if len(filter_zeros) > 0:
             filter_zeros = filter_zeros.transpose()[0] + 1j * filter_zeros.transpose()[1]
+        filter_poles = np.array(self.filter.poles + self.filter.polesf)
+        if len(filter_poles) > 0:
+            filter_poles = filter_poles.transpose()[0] + 1j * filter_poles.transpose()[1]
         self._zeros = np.concatenate((all_pass_zeros, filter_zeros))
+        self._poles = np.concatenate((all_pass_poles, filter_poles))
+        self._nzeros = len(self._zeros)
+        self._npoles = len(self._poles)
+        numerator = np.poly(self._zeros) if self._nzeros != 0 else np.array([1.0])
+        denominator = np.poly(self._poles) if self._npoles != 0 else np.array([1.0])
+        # With conjugate paired roots (the reflect checkbox, paired all-pass stages) the imaginary parts of the
+        # coefficients are rounding noise: drop them so the sample at a time path runs on float64 only
+        self._is_real = conjugate_paired(self._zeros) and conjugate_paired(self._poles)
+        if self._is_real:
+            numerator, denominator = np.real(numerator).astype(float), np.real(denominator).astype(float)
+        self._H_numerator_poly = numerator
+        self._H_denominator_poly = denominator
+        self._feedback_poly = self._H_denominator_poly[1:]
+        self._sos = None
+        # the history follows the orders, keeping the newest samples
+        if len(self._inputs) != self._nzeros + 1:
+            self._inputs.resize(self._nzeros + 1)
+        if len(self._outputs) != self._npoles:
+            self._outputs.resize(self._npoles)
+        self._design_version = design_version
+
+    @property
+    def is_real(self):
+        # False for a design with unpaired complex roots, whose complex coefficients are filtered keeping the
+        # real part of every output
+        self._update_design()
+        return self._is_real
+
+    @property
+    def zeros(self):
+        self._update_design()
         return self._zeros
 
     @zeros.setter
@@ -212,15 +427,7 @@ class OnlineFilter(object):
 
     @property
     def poles(self):
-        all_pass_poles = np.array([])
-        filter_poles = np.array([])
-        for filter in self.all_pass_filters:
-            all_pass_poles = np.append(all_pass_poles, filter.get_poles())
-        filter_poles = self.filter.poles + self.filter.polesf
-        filter_poles = np.array(filter_poles)
-        if len(filter_poles) > 0:
-            filter_poles = filter_poles.transpose()[0] + 1j * filter_poles.transpose()[1]
-        self._poles = np.concatenate((all_pass_poles, filter_poles))
+        self._update_design()
         return self._poles
 
     @poles.setter
@@ -229,8 +436,7 @@ class OnlineFilter(object):
 
     @property
     def nzeros(self):
-        n = len(self.zeros)
-        self._nzeros = n
+        self._update_design()
         return self._nzeros
 
     @nzeros.setter
@@ -239,8 +445,7 @@ class OnlineFilter(object):
 
     @property
     def npoles(self):
-        n = len(self.poles)
-        self._npoles = n
+        self._update_design()
         return self._npoles
 
     @npoles.setter
@@ -249,10 +454,7 @@ class OnlineFilter(object):
 
     @property
     def H_numerator_poly(self):
-        if self.nzeros != 0:
-            self._H_numerator_poly = np.poly(self.zeros)
-        else:
-            self._H_numerator_poly = np.array([1])
+        self._update_design()
         return self._H_numerator_poly
 
     @H_numerator_poly.setter
@@ -261,56 +463,139 @@ class OnlineFilter(object):
 
     @property
     def H_denominator_poly(self):
-        if self.npoles != 0:
-            self._H_denominator_poly = np.poly(self.poles)
-        else:
-            self._H_denominator_poly = np.array([1])
+        self._update_design()
         return self._H_denominator_poly
 
     @H_denominator_poly.setter
     def H_denominator_poly(self, value):
         self._H_denominator_poly = value
 
+    @property
+    def sos(self):
+        self._update_design()
+        if self._sos is None:
+            self._sos = zeros_poles_to_sos(self._zeros, self._poles, self._H_numerator_poly, self._H_denominator_poly)
+        return self._sos
+
     def apply_filter(self):
         if not self.is_consumed:
             self.current_sample_index += 1
+            if self.backend == 'sos':
+                self._apply_filter_sos()
+                return
+            numerator = self.H_numerator_poly
+            denominator = self.H_denominator_poly
             # Handle right-hand side of the difference equation
-
-            while len(self._inputs) >= self.nzeros + 1 and len(self._inputs) != 0:
-                self._inputs.pop()
-            self._inputs.insert(0, self.current_sample)
-            # zero padding for the inputs
-            while len(self._inputs) < self.nzeros + 1:
-                self._inputs.append(0)
-            wighted_input = np.dot(np.array(self._inputs), self.H_numerator_poly)
+            self._inputs.push(self.current_sample)
+            wighted_input = np.dot(self._inputs.values, numerator)
 
             # Handle left-hand side of the difference equation
-            while len(self._outputs) >= self.npoles and len(self._outputs) != 0:
-                self._outputs.pop()
-
-            self._outputs.insert(0, self.current_filtered_sample)
-            # zero padding for the inputs
-            while len(self._outputs) < self.npoles:
-                self._outputs.append(0)
-            wighted_output = np.dot(np.array(self._outputs),
-                                    self.H_denominator_poly[1:] if len(self.H_denominator_poly[1:]) != 0 else [0])
+            self._outputs.push(self.current_filtered_sample)
+            wighted_output = np.dot(self._outputs.values, self._feedback_poly) if self._npoles != 0 else 0
 
-            leading_coefficient = self.H_denominator_poly[0]
+            leading_coefficient = denominator[0]
             self.current_filtered_sample = (wighted_input - wighted_output) / leading_coefficient
-            self.current_filtered_sample = self.current_filtered_sample.real if type(
-                self.current_filtered_sample) == np.complex128 else self.current_filtered_sample
+            if not self._is_real:
+                self.current_filtered_sample = self.current_filtered_sample.real
             self.filtered_signal.append(self.current_filtered_sample)
+            # the block states are rebuilt from the history on the next process_block call
+            self._zi = None
+            self._sos_zi = None
+
+    def process_block(self, samples, store_output=True):
+        samples = np.asarray(samples, dtype=float)
+        if len(samples) == 0:
+            return np.array([])
+        self._update_design()
+        # Past inputs and outputs, newest first, shared with the sample at a time path
+        past_inputs = self._inputs.values.copy()
+        past_outputs = np.concatenate(([self.current_filtered_sample], self._outputs.values))
+
+        if self.backend == 'sos':
+            filtered = self._process_block_sos(samples, past_inputs)
+            self._zi = None
+        else:
+            filtered = self._process_block_direct(samples, past_inputs, past_outputs)
+            self._sos_zi = None
+
+        # Keep the difference equation history in step so apply_filter can carry on from here
+        self._inputs.extend(samples)
+        self._outputs.extend(np.concatenate(([self.current_filtered_sample], filtered[:-1])))
+        self.current_filtered_sample = filtered[-1]
+        if store_output:
+            self.filtered_signal.extend(filtered.tolist())
+        return filtered
+
+    def _process_block_direct(self, samples, past_inputs, past_outputs):
+        # apply_filter keeps only the real part of each output and feeds that back, with a monic
+        # denominator and a real input this is exactly a filter over the real parts of the coefficients
+        from scipy.signal import lfilter, lfiltic
+        numerator = np.real(self.H_numerator_poly)
+        denominator = np.real(self.H_denominator_poly)
+        zi = self._zi
+        if zi is None or self._zi_version != self._design_version:
+            zi = lfiltic(numerator, denominator, past_outputs, past_inputs)
+        filtered, self._zi = lfilter(numerator, denominator, samples, zi=zi)
+        self._zi_version = self._design_version
+        return filtered
+
+    def _sos_state(self, sos, past_inputs):
+        from scipy.signal import sosfilt
+        zi = self._sos_zi
+        if zi is None or self._sos_zi_version != self._design_version:
+            # The per section states can't be recovered from the overall history,
+            # warm the cascade up on the past inputs instead
+            zi = np.zeros((len(sos), 2))
+            if len(past_inputs) > 0:
+                _, zi = sosfilt(sos, past_inputs[::-1], zi=zi)
+            self._sos_zi_version = self._design_version
+        return zi
+
+    def _process_block_sos(self, samples, past_inputs):
+        from scipy.signal import sosfilt
+        sos = self.sos
+        filtered, self._sos_zi = sosfilt(sos, samples, zi=self._sos_state(sos, past_inputs))
+        return filtered
+
+    def _apply_filter_sos(self):
+        sos = self.sos
+        zi = self._sos_state(sos, self._inputs.values)
+        sample = self.current_sample
+        # sosfilt is dominated by its call overhead for a single sample,
+        # step the sections in transposed direct form II instead
+        value = sample
+        for (b0, b1, b2, _, a1, a2), state in zip(sos.tolist(), zi):
+            output = b0 * value + state[0]
+            state[0] = b1 * value - a1 * output + state[1]
+            state[1] = b2 * value - a2 * output
+            value = output
+        self._sos_zi = zi
+        self._zi = None
+
+        self._inputs.push(sample)
+        self._outputs.push(self.current_filtered_sample)
+        self.current_filtered_sample = value
+        self.filtered_signal.append(self.current_filtered_sample)
 
     def reset(self):
-        self._current_sample_index = -1
-        self._current_sample = None
-        self._current_filtered_sample = 0
-        self._filtered_signal = []
+        self.clear_state()
         self._H_numerator_poly = []
         self._H_denominator_poly = []
-        self._is_consumed = True if len(self.signal) == 0 else False
-        self._inputs = []
-        self._outputs = []
+        self._design_version = None
+        self._sos = None
 
         self.all_pass_filters = []
 
+    def clear_state(self):
+        # start over on a new signal keeping the design and its cached coefficients
+        self._current_sample_index = -1
+        self._current_sample = None
+        self._current_filtered_sample = 0
+        self._filtered_signal = []
+        self._is_consumed = True if len(self.signal) == 0 else False
+        self._inputs.clear()
+        self._outputs.clear()
+        self._zi = None
+        self._zi_version = None
+        self._sos_zi = None
+        self._sos_zi_version = None
@@ -0,0 +1,219 @@
+# All-pass phase equalizer: searches the coefficients of a cascade of all-pass stages that make the group delay
+# of a z-plane design as flat as possible over its passband. The stages come two by two as either two real
+# coefficients or a conjugate pair (plus one real stage for an odd count) so the equalized filter stays real.
+# usage: python -m all_pass_optimizer design.json --stages 4 [--passband 0 1.2] [--restarts 8 --workers 4] [-o out.json]
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from all_pass_filter import all_pass_cascade_group_delay
+from filter_design import FilterDesign
+from frequency_response import FrequencyResponse, design_group_delay
+
+MAX_RADIUS = 0.95  # of the searched coefficients, the all-pass poles stay clear of the unit circle
+PASSBAND_LEVEL = 1 / np.sqrt(2)  # -3 dB, relative to the peak magnitude
+
+
+def passband_mask(magnitude, level=PASSBAND_LEVEL):
+    # frequencies where the magnitude is within level of its peak, all of them for a flat (or empty) design
+    magnitude = np.asarray(magnitude, dtype=float)
+    peak = magnitude.max() if len(magnitude) > 0 else 0
+    if not np.isfinite(peak) or peak <= 0:
+        return np.ones(len(magnitude), dtype=bool)
+    return magnitude >= level * peak
+
+
+def coefficients_from_parameters(parameters):
+    # (..., D) search parameters -> (..., K) coefficients. Every two stages come from a point (x, y): the
+    # conjugate pair x +- jy for y >= 0, the two real coefficients x +- |y| for y < 0 (both meet in the double
+    # root x at y = 0), then the real coefficient of the odd stage if any.
+    pairs = parameters.shape[-1] // 2
+    x, y = parameters[..., 0:2 * pairs:2], parameters[..., 1:2 * pairs:2]
+    offset = np.where(y >= 0, 1j * y, -y + 0j)
+    coefficients = [x + offset, x - offset]
+    if parameters.shape[-1] % 2:
+        coefficients.append(parameters[..., -1:].astype(complex))
+    return np.concatenate(coefficients, axis=-1)
+
+
+def parameter_bounds(stages, max_radius=MAX_RADIUS):
+    lower = np.full(stages, -max_radius)
+    upper = np.full(stages, max_radius)
+    return lower, upper
+
+
+def project_parameters(parameters, max_radius=MAX_RADIUS):
+    # Shrink the pairs toward 0 until both coefficients are within max_radius: |x + jy| for a conjugate pair,
+    # |x| + |y| for two real coefficients
+    parameters = np.clip(parameters, -max_radius, max_radius)
+    pairs = parameters.shape[-1] // 2
+    x, y = parameters[..., 0:2 * pairs:2], parameters[..., 1:2 * pairs:2]
+    size = np.where(y >= 0, np.hypot(x, y), np.abs(x) + np.abs(y))
+    scale = np.minimum(1, max_radius / np.maximum(size, max_radius))
+    parameters[..., 0:2 * pairs:2] = x * scale
+    parameters[..., 1:2 * pairs:2] = y * scale
+    return parameters
+
+
+def add_stage(parameters):
+    # the same cascade with one more stage at a = 0, a pure delay that doesn't change the group delay variation:
+    # a real odd stage r becomes the real pair (r / 2, -r / 2) = {r, 0}, a count of pairs gets a real stage
+    parameters = np.asarray(parameters, dtype=float)
+    if len(parameters) % 2:
+        return np.concatenate((parameters[:-1], [parameters[-1] / 2, -parameters[-1] / 2]))
+    return np.concatenate((parameters, [0.0]))
+
+
+def group_delay_variation(coefficients, frequencies, base_delay):
+    # standard deviation over the frequencies of the equalized group delay, for (..., K) coefficients
+    return np.std(base_delay + all_pass_cascade_group_delay(coefficients, frequencies), axis=-1)
+
+
+def _search(base_delay, frequencies, stages, seed, population, iterations, elite_fraction, initial=None):
+    # Cross-entropy search: every iteration draws a population of candidates from a normal distribution over
+    # the parameters, scores them all in one vectorized group delay evaluation and refits the distribution to
+    # the best ones. The best candidate so far (initially the given one) is always part of the population, and
+    # is refined by _polish at the end. Returns (variation, parameters) of the result.
+    rng = np.random.default_rng(seed)
+    lower, upper = parameter_bounds(stages)
+    mean = rng.uniform(lower, upper)
+    std = (upper - lower) / 2
+    elites = max(2, int(population * elite_fraction))
+    best_parameters, best_variation = None, np.inf
+    if initial is not None:
+        best_parameters = np.asarray(initial, dtype=float)
+        best_variation = group_delay_variation(coefficients_from_parameters(best_parameters), frequencies, base_delay)
+    for _ in range(iterations):
+        candidates = project_parameters(rng.normal(mean, std, (population, len(mean))))
+        if best_parameters is not None:
+            candidates[0] = best_parameters
+        variation = group_delay_variation(coefficients_from_parameters(candidates), frequencies, base_delay)
+        order = np.argsort(variation)
+        if variation[order[0]] < best_variation:
+            best_variation, best_parameters = variation[order[0]], candidates[order[0]].copy()
+        elite = candidates[order[:elites]]
+        mean = elite.mean(axis=0)
+        std = 0.7 * elite.std(axis=0) + 0.3 * std
+        if np.all(std < 1e-6 * (upper - lower)):
+            break
+    return _polish(base_delay, frequencies, best_variation, best_parameters)
+
+
+def _polish(base_delay, frequencies, variation, parameters, step=0.02, min_step=1e-6, max_steps=500):
+    # Pattern search from the best candidate: the 2 D moves of one step along every parameter are scored in
+    # one evaluation, the best improving one is taken, the step halves when none improves
+    moves = np.concatenate((np.eye(len(parameters)), -np.eye(len(parameters))))
+    for _ in range(max_steps):
+        if step < min_step:
+            break
+        candidates = project_parameters(parameters + step * moves)
+        variations = group_delay_variation(coefficients_from_parameters(candidates), frequencies, base_delay)
+        best = np.argmin(variations)
+        if variations[best] < variation:
+            variation, parameters = variations[best], candidates[best]
+        else:
+            step /= 2
+    return variation, parameters
+
+
+def optimize_all_pass(zeros, poles, stages=4, passband=None, restarts=4, workers=1, worN=512, population=128,
+                      iterations=100, elite_fraction=0.1, seed=0):
+    # zeros, poles: complex roots of the design to equalize (conjugates included)
+    # passband: (low, high) in rad/sample, or None for the -3 dB passband of the design
+    # The stage counts are searched from 1 up to stages, each search starting from the best cascade of one stage
+    # less plus a pure delay, so more stages never give a worse result (nor a different one for the smaller
+    # counts, with the same seed).
+    # Returns a dict with the coefficients (as Python numbers, at most stages of them), the group delay
+    # variation (std in samples over the passband) before and after, and the search time.
+    start = time.perf_counter()
+    if stages < 1:
+        raise ValueError('at least one all-pass stage is needed')
+    response = FrequencyResponse(worN)
+    response.set_roots(zeros, poles)
+    if passband is None:
+        mask = passband_mask(response.magnitude)
+    else:
+        low, high = passband
+        mask = (response.frequencies >= low) & (response.frequencies <= high)
+        if not mask.any():
+            raise ValueError(f"the passband {low}..{high} rad/sample holds no frequency of the grid")
+    frequencies = response.frequencies[mask]
+    base_delay = design_group_delay(zeros, poles, frequencies)
+
+    workers = max(1, min(workers, restarts))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        parameters = None
+        for count in range(1, stages + 1):
+            initial = add_stage(parameters) if parameters is not None else None
+            seeds = np.random.SeedSequence([seed, count]).generate_state(restarts)
+            arguments = [(base_delay, frequencies, count, int(restart_seed), population, iterations, elite_fraction,
+                          initial) for restart_seed in seeds]
+            if executor is None:
+                results = [_search(*restart_arguments) for restart_arguments in arguments]
+            else:
+                results = list(executor.map(_search, *zip(*arguments)))
+            variation, parameters = min(results, key=lambda result: result[0])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # a stage left at a = 0 is a pure delay, it isn't worth a filter
+    coefficients = [complex(a) if a.imag != 0 else float(a.real) for a in coefficients_from_parameters(parameters)
+                    if a != 0]
+    return {'coefficients': coefficients, 'variation': float(variation),
+            'initial_variation': float(np.std(base_delay)),
+            'passband': (float(frequencies[0]), float(frequencies[-1])), 'seconds': time.perf_counter() - start}
+
+
+def design_roots(design):
+    # complex zeros and poles of a FilterDesign, conjugates included, like ZPlaneSignalFilter.design_roots
+    zeros = [complex(x, y) for x, y in design.zeros + design.zerosf]
+    poles = [complex(x, y) for x, y in design.poles + design.polesf]
+    return zeros, poles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m all_pass_optimizer',
+                                     description='Search all-pass coefficients flattening the group delay of a design')
+    parser.add_argument('design', help='design JSON file, see FilterDesign')
+    parser.add_argument('-k', '--stages', type=int, default=4, help='number of all-pass stages')
+    parser.add_argument('--passband', type=float, nargs=2, metavar=('LOW', 'HIGH'),
+                        help='passband in rad/sample (default: the -3 dB passband of the design)')
+    parser.add_argument('--restarts', type=int, default=4, help='independent searches, the best one is kept')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes for the restarts (default: number of CPUs)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='write the design with the found all-pass stages to this JSON file')
+    args = parser.parse_args(argv)
+
+    try:
+        design = FilterDesign.load(args.design)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        parser.error(f"can't load the design {args.design}: {error}")
+    if args.stages < 1 or args.restarts < 1:
+        parser.error('--stages and --restarts must be at least 1')
+    workers = args.workers if args.workers is not None else os.cpu_count() or 1
+
+    zeros, poles = design_roots(design)
+    try:
+        result = optimize_all_pass(zeros, poles, args.stages, args.passband, args.restarts, workers, seed=args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    low, high = result['passband']
+    print(f"passband {low:.3f}..{high:.3f} rad/sample, group delay std {result['initial_variation']:.4f} -> "
+          f"{result['variation']:.4f} samples in {result['seconds']:.3f} s")
+    print(json.dumps(FilterDesign(all_pass=result['coefficients']).to_dict()['all_pass']))
+    if args.output is not None:
+        design.all_pass = result['coefficients']
+        design.save(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
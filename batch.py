@@ -0,0 +1,174 @@
+# Headless batch filtering: apply a saved z-plane design to CSV signal files
+# usage: python -m batch design.json signal.csv [-o filtered.csv] [--backend sos]
+#        python -m batch design.json files/ more/*.csv --output-dir out/ --workers 8 [--summary summary.json]
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from all_pass_filter import AllPassFilter, OnlineFilter
+from filter_design import FilterDesign
+from signal_io import iter_signal_chunks, load_signal
+
+
+def read_signal(filename):
+    # same layout MainApp.open_signal reads: a header row then time and value columns
+    return load_signal(filename)
+
+
+OUTPUT_HEADER = 'Time [s],filtered'
+
+
+def write_signal(filename, time, values):
+    np.savetxt(filename, np.column_stack((time, values)), delimiter=',', fmt='%.10g', header=OUTPUT_HEADER,
+               comments='')
+
+
+def create_filter(design, backend='direct'):
+    all_pass_filters = [AllPassFilter(a) for a in design.all_pass]
+    return OnlineFilter([], design, all_pass_filters, backend=backend)
+
+
+def filter_signal(design, samples, backend='direct'):
+    return create_filter(design, backend).process_block(samples, store_output=False)
+
+
+def default_output(input_file, output_dir=None):
+    input_file = Path(input_file)
+    output_dir = Path(output_dir) if output_dir is not None else input_file.parent
+    return output_dir / f"{input_file.stem}_filtered.csv"
+
+
+def run_file(online_filter, input_file, output_file):
+    # filter one file with an already built filter, starting from a clean state. The file is streamed block by
+    # block, the filter state carries over between blocks and each filtered block is appended to the output.
+    start = time.perf_counter()
+    online_filter.clear_state()
+    samples = 0
+    with open(output_file, 'w') as output:
+        output.write(OUTPUT_HEADER + '\n')
+        for signal_time, values in iter_signal_chunks(input_file):
+            filtered = online_filter.process_block(values, store_output=False)
+            np.savetxt(output, np.column_stack((signal_time, filtered)), delimiter=',', fmt='%.10g')
+            samples += len(values)
+    return {'input': str(input_file), 'output': str(output_file), 'samples': samples,
+            'seconds': time.perf_counter() - start}
+
+
+def filter_file(design, input_file, output_file=None, backend='direct'):
+    output_file = output_file if output_file is not None else default_output(input_file)
+    run_file(create_filter(design, backend), input_file, output_file)
+    return output_file
+
+
+# Each worker process builds the filter (roots, coefficients and sections) once in its initializer
+# and reuses it for every file it is handed
+_worker_filter = None
+
+
+def _init_worker(design_dict, backend):
+    global _worker_filter
+    _worker_filter = create_filter(FilterDesign.from_dict(design_dict), backend)
+    # build the coefficients (and the sections) now rather than on the first file
+    _worker_filter.H_numerator_poly
+    if backend == 'sos':
+        _worker_filter.sos
+
+
+def _run_worker_file(input_file, output_file):
+    return run_file(_worker_filter, input_file, output_file)
+
+
+def filter_files(design, jobs, backend='direct', workers=1):
+    # jobs: (input, output) pairs. Returns one result per file, in the order of the jobs.
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        online_filter = create_filter(design, backend)
+        return [run_file(online_filter, input_file, output_file) for input_file, output_file in jobs]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(design.to_dict(), backend)) as executor:
+        futures = {executor.submit(_run_worker_file, input_file, output_file): index
+                   for index, (input_file, output_file) in enumerate(jobs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[index] for index in range(len(jobs))]
+
+
+def collect_inputs(paths):
+    # each file once, even when named twice or through a directory and a path to it: two jobs on the same file
+    # would race on its sidecar
+    inputs = []
+    seen = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            candidates = sorted(p for p in path.glob('*.csv') if not p.stem.endswith('_filtered'))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            resolved = candidate.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                inputs.append(candidate)
+    return inputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m batch',
+                                     description='Apply a z-plane/all-pass design to CSV signal files')
+    parser.add_argument('design', help='design JSON file, see FilterDesign')
+    parser.add_argument('inputs', nargs='+', metavar='input',
+                        help='CSV files (header row, time column, value column) or directories of them')
+    parser.add_argument('-o', '--output', help='filtered CSV file for a single input (default: <input>_filtered.csv)')
+    parser.add_argument('--output-dir', help='directory for the filtered files (default: next to each input)')
+    parser.add_argument('--backend', choices=OnlineFilter.BACKENDS, default='direct',
+                        help='direct form or second order sections filtering')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--summary', help='write the per file timings and outputs to this JSON file')
+    args = parser.parse_args(argv)
+
+    try:
+        design = FilterDesign.load(args.design)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        parser.error(f"can't load the design {args.design}: {error}")
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        parser.error('no CSV files to filter')
+    if args.output is not None and len(inputs) != 1:
+        parser.error('--output needs exactly one input file, use --output-dir instead')
+    workers = args.workers if args.workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.output_dir is not None:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    if args.output is not None:
+        jobs = [(inputs[0], Path(args.output))]
+    else:
+        jobs = [(input_file, default_output(input_file, args.output_dir)) for input_file in inputs]
+
+    start = time.perf_counter()
+    results = filter_files(design, jobs, args.backend, workers)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        print(f"{result['input']} -> {result['output']} ({result['samples']} samples, {result['seconds']:.3f} s)")
+    samples = sum(result['samples'] for result in results)
+    print(f"{len(results)} files, {samples} samples in {elapsed:.3f} s ({samples / elapsed:.0f} samples/s)")
+
+    if args.summary is not None:
+        with open(args.summary, 'w') as summary_file:
+            json.dump({'design': str(args.design), 'backend': args.backend, 'workers': workers,
+                       'seconds': elapsed, 'samples': samples, 'files': results}, summary_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# usage: python -m benchmarks [-o results.json] [--compare previous.json] [-k apply_filter -k loading]
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.suite import REPO_DIR, run_suite
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous):
+    # ratio > 1 means slower than the previous run
+    print(f"\n{'benchmark':<60} {'previous us':>12} {'current us':>12} {'ratio':>7}")
+    for name, result in results.items():
+        if name in previous:
+            before, after = previous[name]['median'], result['median']
+            print(f"{name:<60} {before * 1e6:>12.2f} {after * 1e6:>12.2f} {after / before:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the micro-benchmark suite')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    parser.add_argument('-k', dest='selection', action='append',
+                        help='only run the benchmarks whose name contains this text (repeatable)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum seconds per repeat')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.selection, args.repeat, args.min_time)
+    if args.output:
+        import numpy
+        import scipy
+        meta = {'revision': git_revision(), 'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(), 'numpy': numpy.__version__, 'scipy': scipy.__version__,
+                'machine': platform.machine(), 'processor': platform.processor()}
+        with open(args.output, 'w') as output:
+            json.dump({'meta': meta, 'results': results}, output, indent=2)
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(results, json.load(previous)['results'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Compare the direct form and the second order sections backends of the OnlineFilter
+# usage: python -m benchmarks.filter_backends [--orders 2 4 8 ...] [--samples N]
+import argparse
+import time
+
+import numpy as np
+
+from all_pass_filter import OnlineFilter
+from filter_design import FilterDesign
+
+
+def random_design(order, seed=0):
+    # conjugate pairs of zeros/poles inside the unit circle, as placed with the reflect checkbox
+    rng = np.random.default_rng(seed)
+    design = FilterDesign()
+    for _ in range(order // 2):
+        radius, angle = rng.uniform(0.5, 0.98), rng.uniform(0.05, np.pi - 0.05)
+        design.add_zero(radius * np.cos(angle), radius * np.sin(angle), conjugate=True)
+        radius, angle = rng.uniform(0.5, 0.98), rng.uniform(0.05, np.pi - 0.05)
+        design.add_pole(radius * np.cos(angle), radius * np.sin(angle), conjugate=True)
+    return design
+
+
+def time_per_sample(online_filter, samples):
+    online_filter.signal = samples
+    start = time.perf_counter()
+    while not online_filter.is_consumed:
+        online_filter.apply_filter()
+    return (time.perf_counter() - start) / len(samples)
+
+
+def time_block(online_filter, samples, block_size):
+    start = time.perf_counter()
+    outputs = [online_filter.process_block(samples[i:i + block_size]) for i in range(0, len(samples), block_size)]
+    return (time.perf_counter() - start) / len(samples), np.concatenate(outputs)
+
+
+def run(orders, n_samples, block_size):
+    rng = np.random.default_rng(1)
+    samples = rng.standard_normal(n_samples)
+    results = []
+    for order in orders:
+        design = random_design(order)
+        row = {'order': order}
+        outputs = {}
+        for backend in OnlineFilter.BACKENDS:
+            per_sample = time_per_sample(OnlineFilter([], design, backend=backend), samples[:min(n_samples, 2000)].tolist())
+            per_block, outputs[backend] = time_block(OnlineFilter([], design, backend=backend), samples, block_size)
+            row[backend] = {'per_sample_us': per_sample * 1e6, 'block_ns_per_sample': per_block * 1e9}
+        # the cascade never expands the roots into one polynomial, use it as the reference
+        reference = outputs['sos']
+        scale = np.max(np.abs(reference)) or 1
+        row['direct_max_rel_error'] = float(np.max(np.abs(outputs['direct'] - reference)) / scale)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the direct form and the second order sections filtering backends")
+    parser.add_argument('--orders', type=int, nargs='+', default=[2, 4, 8, 12, 16, 20, 24])
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--block-size', type=int, default=4096)
+    args = parser.parse_args()
+
+    print(f"{'order':>5} | {'direct us/sample':>16} {'sos us/sample':>14} | "
+          f"{'direct ns/sample':>16} {'sos ns/sample':>14} | {'direct rel. error':>17}")
+    for row in run(args.orders, args.samples, args.block_size):
+        print(f"{row['order']:>5} | {row['direct']['per_sample_us']:>16.2f} {row['sos']['per_sample_us']:>14.2f} | "
+              f"{row['direct']['block_ns_per_sample']:>16.1f} {row['sos']['block_ns_per_sample']:>14.1f} | "
+              f"{row['direct_max_rel_error']:>17.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# Time to first window: a fresh interpreter imports the application, builds the MainApp and shows it offscreen
+# usage: python -m benchmarks.startup [--repeat 5]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# run in the child interpreter, prints the stage times as JSON
+CHILD = '''
+import time
+start = time.perf_counter()
+import json
+import sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+import index
+imported = time.perf_counter()
+window = index.MainApp()
+built = time.perf_counter()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({'import': imported - start, 'construct': built - imported, 'show': shown - built,
+                  'first_window': shown - start}))
+'''
+
+
+def launch():
+    # seconds per stage of one start, 'process' also counts the interpreter start and exit
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=REPO_DIR, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    stages = json.loads(output.strip().splitlines()[-1])
+    stages['process'] = time.perf_counter() - start
+    return stages
+
+
+def run(repeat=5):
+    launches = [launch() for _ in range(repeat)]
+    return {stage: statistics.median(result[stage] for result in launches) for stage in launches[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time to the first window of the application')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    for stage, seconds in run(args.repeat).items():
+        print(f"{stage:<14} {seconds * 1e3:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+# Micro-benchmarks of the filter engine, the response computation, the all-pass library, the signal loading
+# and the application startup.
+# Results are written as JSON so runs of different commits can be compared, see benchmarks/__main__.py
+import os
+
+# the response and all-pass benchmarks create widgets, never open a window
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.filter_backends import random_design
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+FILTER_ORDERS = [2, 4, 8, 16, 32]
+ROOT_COUNTS = [2, 8, 32, 64]
+ALL_PASS_STAGES = [1, 4, 16]
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def measure(func, repeat=5, min_time=0.05):
+    # seconds per call: the call count is calibrated so that one repeat lasts at least min_time
+    # one untimed call first, a cold call (lazy imports, caches) would make the calibration settle on number=1
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {'min': min(timings), 'median': statistics.median(timings), 'mean': statistics.mean(timings),
+            'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0, 'number': number, 'repeat': repeat,
+            'unit': 's'}
+
+
+_app = None
+
+
+def qt_app():
+    global _app
+    from PyQt5.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+@benchmark
+def online_filter_apply_filter(run):
+    from all_pass_filter import OnlineFilter
+    samples = np.random.default_rng(0).standard_normal(10000)
+    for backend in OnlineFilter.BACKENDS:
+        for order in FILTER_ORDERS:
+            online_filter = OnlineFilter(samples, random_design(order), backend=backend)
+
+            def step():
+                if online_filter.is_consumed:
+                    online_filter.clear_state()
+                online_filter.apply_filter()
+
+            run(f"online_filter.apply_filter[{backend},order={order}]", step)
+
+
+@benchmark
+def online_filter_process_block(run):
+    from all_pass_filter import OnlineFilter
+    block = np.random.default_rng(0).standard_normal(4096)
+    for backend in OnlineFilter.BACKENDS:
+        for order in FILTER_ORDERS:
+            online_filter = OnlineFilter([], random_design(order), backend=backend)
+            run(f"online_filter.process_block[{backend},order={order},block=4096]",
+                lambda: online_filter.process_block(block, store_output=False))
+
+
+def z_plane_filter(n_roots):
+    import pyqtgraph as pg
+    from PyQt5.QtWidgets import QCheckBox
+    from ZPlane import ZPlaneSignalFilter
+    qt_app()
+    z_plane = ZPlaneSignalFilter(pg.PlotWidget(), pg.PlotWidget(), pg.PlotWidget(), pg.PlotWidget(), QCheckBox())
+    rng = np.random.default_rng(0)
+    zeros = list(rng.uniform(-1, 1, n_roots // 2) + 1j * rng.uniform(-1, 1, n_roots // 2))
+    poles = list(0.9 * (rng.uniform(-1, 1, n_roots // 2) + 1j * rng.uniform(-1, 1, n_roots // 2)))
+    return z_plane, zeros, poles
+
+
+@benchmark
+def z_plane_plot_response(run):
+    for n_roots in ROOT_COUNTS:
+        z_plane, zeros, poles = z_plane_filter(n_roots)
+        z_plane.plot_response(zeros, poles)
+        offsets = iter(np.tile(np.linspace(-0.01, 0.01, 101), 1 << 16))
+
+        def drag():
+            # one root moves per event, like a dragged TargetItem
+            zeros[0] = zeros[0].real + next(offsets) + 1j * zeros[0].imag
+            z_plane.plot_response(zeros, poles)
+
+        def full():
+            # a new set of roots, nothing can be reused
+            z_plane.response.set_roots([], [])
+            z_plane.plot_response(zeros, poles)
+
+        run(f"z_plane.plot_response[drag,roots={n_roots}]", drag)
+        run(f"z_plane.plot_response[full,roots={n_roots}]", full)
+
+
+@benchmark
+def all_pass(run):
+    from all_pass_filter import AllPassFilter, AllPassFilterFeature
+    import pyqtgraph as pg
+    qt_app()
+    coefficients = [0.1, 0.5 + 0.2j, 0.9, 0.3 + 0.7j]
+    run("all_pass.AllPassFilter[real]", lambda: AllPassFilter(0.5))
+    run("all_pass.AllPassFilter[complex]", lambda: AllPassFilter(0.3 + 0.4j))
+    for stages in ALL_PASS_STAGES:
+        filters = [AllPassFilter(coefficients[i % len(coefficients)]) for i in range(stages)]
+        feature = AllPassFilterFeature(filters=filters, phase_w=pg.PlotWidget(), poles_zeros_w=pg.PlotWidget())
+        run(f"all_pass.get_scene[stages={stages}]", feature.get_scene)
+
+
+@benchmark
+def signal_loading(run):
+    from signal_io import load_csv, write_sidecar
+    # work on copies so the sidecars don't end up next to the repository files
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for csv_file in sorted((REPO_DIR / 'files').glob('*.csv')):
+            copy = Path(tmp_dir) / csv_file.name
+            shutil.copyfile(csv_file, copy)
+            run(f"signal_loading.parse_csv[{csv_file.name}]", lambda: load_csv(copy, use_sidecar=False))
+            write_sidecar(copy)
+            run(f"signal_loading.sidecar[{csv_file.name}]", lambda: load_csv(copy))
+
+
+@benchmark
+def startup(run):
+    from benchmarks.startup import launch
+    run("startup.first_window", launch)
+
+
+def run_suite(selection=None, repeat=5, min_time=0.05, log=print):
+    results = {}
+
+    def run(name, func):
+        if selection and not any(pattern in name for pattern in selection):
+            return
+        results[name] = measure(func, repeat, min_time)
+        log(f"{name:<60} {results[name]['median'] * 1e6:>12.2f} us")
+
+    for func in BENCHMARKS:
+        func(run)
+    return results
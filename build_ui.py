@@ -0,0 +1,57 @@
+# Compiles main.ui into main_ui.py so the application doesn't parse the .ui file on every start.
+# Run it after editing main.ui:
+#   python build_ui.py
+#   python build_ui.py --check   (exit status 1 when main_ui.py is out of date, nothing is written)
+import argparse
+import io
+import sys
+from pathlib import Path
+
+from PyQt5 import uic
+
+REPO_DIR = Path(__file__).resolve().parent
+UI_FILES = {'main.ui': 'main_ui.py'}
+
+
+def compile_ui(ui_file):
+    # the generated header names the source file, keep it relative to the repository
+    source = io.StringIO((REPO_DIR / ui_file).read_text())
+    source.name = ui_file
+    target = io.StringIO()
+    uic.compileUi(source, target)
+    return target.getvalue()
+
+
+def build(ui_file, py_file):
+    with open(REPO_DIR / py_file, 'w') as target:
+        target.write(compile_ui(ui_file))
+    print(f"{ui_file} -> {py_file}")
+
+
+def is_current(ui_file, py_file):
+    try:
+        return (REPO_DIR / py_file).read_text() == compile_ui(ui_file)
+    except FileNotFoundError:
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python build_ui.py',
+                                     description='Compile the Qt Designer files into the Python modules the '
+                                                 'application imports')
+    parser.add_argument('--check', action='store_true',
+                        help="don't write anything, exit with status 1 when a compiled module is out of date")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = [py_file for ui_file, py_file in UI_FILES.items() if not is_current(ui_file, py_file)]
+        for py_file in stale:
+            print(f"{py_file} is out of date, run python build_ui.py")
+        return 1 if stale else 0
+    for ui_file, py_file in UI_FILES.items():
+        build(ui_file, py_file)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
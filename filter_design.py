@@ -0,0 +1,85 @@
+import json
+
+
+class FilterDesign(object):
+    # Plain container of a z-plane design exposing the same attributes the OnlineFilter reads from
+    # ZPlaneSignalFilter, so a design can be filtered without any widgets
+    def __init__(self, zeros=None, poles=None, zerosf=None, polesf=None, all_pass=None):
+        self.zeros = list(zeros) if zeros is not None else []
+        self.poles = list(poles) if poles is not None else []
+        # conjugates of the placed zeros/poles, as added by the reflect checkbox
+        self.zerosf = list(zerosf) if zerosf is not None else []
+        self.polesf = list(polesf) if polesf is not None else []
+        # all-pass coefficients, real or complex
+        self.all_pass = list(all_pass) if all_pass is not None else []
+        self.design_version = 0
+
+    def design_changed(self):
+        self.design_version += 1
+
+    def add_zero(self, x, y, conjugate=False):
+        self.zeros.append((x, y))
+        if conjugate:
+            self.zerosf.append((x, -y))
+        self.design_changed()
+
+    def add_pole(self, x, y, conjugate=False):
+        self.poles.append((x, y))
+        if conjugate:
+            self.polesf.append((x, -y))
+        self.design_changed()
+
+    # Design files are JSON objects holding [x, y] pairs for the roots and the all-pass coefficients
+    # either as numbers or as [real, imag] pairs:
+    # {"zeros": [[0.5, 0.5]], "zerosf": [[0.5, -0.5]], "poles": [[0.8, 0]], "polesf": [], "all_pass": [0.5, [0.3, 0.4]]}
+    @classmethod
+    def from_dict(cls, data):
+        # a malformed design raises a ValueError naming the bad key
+        if not isinstance(data, dict):
+            raise ValueError(f"a design is a JSON object, not {type(data).__name__}")
+        unknown = set(data) - {'zeros', 'zerosf', 'poles', 'polesf', 'all_pass'}
+        if unknown:
+            raise ValueError(f"unknown design keys: {', '.join(sorted(unknown))}")
+
+        def roots(key):
+            try:
+                return [(float(x), float(y)) for x, y in data.get(key, [])]
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a list of [x, y] pairs of numbers") from None
+
+        def coefficient(a):
+            if isinstance(a, (list, tuple)):
+                real, imag = a
+                return complex(real, imag) if imag != 0 else float(real)
+            return float(a)
+
+        try:
+            all_pass = [coefficient(a) for a in data.get('all_pass', [])]
+        except (TypeError, ValueError):
+            raise ValueError('all_pass must be a list of numbers or [real, imag] pairs of numbers') from None
+        return cls(zeros=roots('zeros'), poles=roots('poles'), zerosf=roots('zerosf'), polesf=roots('polesf'),
+                   all_pass=all_pass)
+
+    def to_dict(self):
+        return {
+            'zeros': [list(z) for z in self.zeros],
+            'zerosf': [list(z) for z in self.zerosf],
+            'poles': [list(p) for p in self.poles],
+            'polesf': [list(p) for p in self.polesf],
+            'all_pass': [[a.real, a.imag] if isinstance(a, complex) else a for a in self.all_pass],
+        }
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename) as design_file:
+            return cls.from_dict(json.load(design_file))
+
+    def save(self, filename):
+        with open(filename, 'w') as design_file:
+            json.dump(self.to_dict(), design_file, indent=2)
+
+    @classmethod
+    def from_z_plane(cls, z_plane, all_pass=None):
+        # snapshot of the design currently placed on a ZPlaneSignalFilter
+        return cls(zeros=z_plane.zeros, poles=z_plane.poles, zerosf=z_plane.zerosf, polesf=z_plane.polesf,
+                   all_pass=all_pass)
@@ -0,0 +1,139 @@
+import threading
+
+import numpy as np
+
+from instrumentation import probe
+
+RING_CAPACITY = 1 << 20  # samples
+
+
+class SampleRing(object):
+    # Single producer, single consumer ring of float samples. The producer only moves the write count and
+    # the consumer only the read count, so the two threads never need a lock: a side sees at worst fewer
+    # samples (or less free space) than there really are.
+    def __init__(self, capacity=RING_CAPACITY):
+        self._buffer = np.empty(capacity)
+        self._written = 0
+        self._read = 0
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    @property
+    def available(self):
+        return self._written - self._read
+
+    @property
+    def free(self):
+        return self.capacity - self.available
+
+    def write(self, values):
+        # producer side, returns the number of values stored (the ones that fit)
+        values = np.asarray(values, dtype=float).ravel()
+        count = min(len(values), self.free)
+        start = self._written % self.capacity
+        first = min(count, self.capacity - start)
+        self._buffer[start:start + first] = values[:first]
+        self._buffer[:count - first] = values[first:count]
+        self._written += count
+        return count
+
+    def read(self, max_count=None):
+        # consumer side, a copy of the oldest available values
+        count = self.available if max_count is None else min(max_count, self.available)
+        start = self._read % self.capacity
+        first = min(count, self.capacity - start)
+        values = np.concatenate((self._buffer[start:start + first], self._buffer[:count - first]))
+        self._read += count
+        return values
+
+
+class FilterWorker(object):
+    # Runs an OnlineFilter on a background thread. The GUI submits input samples and takes the filtered ones
+    # when it renders, through two SampleRings. The worker never takes more input than the output ring can
+    # hold, so the GUI is the only place samples can be lost:
+    #   dropped_samples  input samples that didn't fit in the input ring (the worker is too far behind)
+    #   late_samples     input samples not filtered yet when their frame came: a sample submitted before a take is
+    #                    due at the next take, each late sample is counted once
+    def __init__(self, online_filter, capacity=RING_CAPACITY):
+        self.online_filter = online_filter
+        self._capacity = capacity
+        self._thread = None
+        self.dropped_samples = 0
+        self.late_samples = 0
+        self.start()
+
+    @property
+    def free(self):
+        # input samples that can be submitted without dropping any
+        return self._inputs.free
+
+    @property
+    def pending(self):
+        # nonzero while submitted samples haven't all been taken, the block being filtered may be counted twice
+        return self._inputs.available + self._outputs.available + self._processing
+
+    def start(self):
+        self._inputs = SampleRing(self._capacity)
+        self._outputs = SampleRing(self._capacity)
+        self._processing = 0
+        # GUI side totals of the submitted and taken samples, for the late samples
+        self._submitted = 0
+        self._taken = 0
+        self._due = 0  # samples submitted before the previous take
+        self._late_counted = 0  # samples up to which the late ones are already counted
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='filter-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopped = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        # drop the queued samples and clear the filter state, the filter is only touched while the thread is stopped
+        self.stop()
+        self.online_filter.clear_state()
+        self.dropped_samples = 0
+        self.late_samples = 0
+        self.start()
+
+    def submit(self, samples):
+        samples = np.asarray(samples, dtype=float).ravel()
+        accepted = self._inputs.write(samples)
+        self._submitted += accepted
+        self.dropped_samples += len(samples) - accepted
+        self._wake.set()
+        return accepted
+
+    def take(self):
+        # every filtered sample produced since the last call
+        filtered = self._outputs.read()
+        self._taken += len(filtered)
+        # the samples due now are the ones submitted before the previous take, those still not filtered are late
+        first_late = max(self._taken, self._late_counted)
+        if self._due > first_late:
+            self.late_samples += self._due - first_late
+        self._late_counted = max(self._late_counted, self._due)
+        self._due = self._submitted
+        return filtered
+
+    def _run(self):
+        while not self._stopped:
+            # cleared before reading, a submit racing with the read sets it again
+            self._wake.clear()
+            self._processing = min(self._inputs.available, self._outputs.free)
+            if self._processing == 0:
+                self._wake.wait()
+                continue
+            block = self._inputs.read(self._processing)
+            with probe.stage('filter.block'):
+                filtered = self.online_filter.process_block(block, store_output=False)
+            probe.count_samples(len(block))
+            self._outputs.write(filtered)
+            self._processing = 0
@@ -0,0 +1,91 @@
+import time
+
+from PyQt5.QtCore import Qt, QTimer
+
+from instrumentation import probe
+
+FRAME_INTERVAL = 16  # milliseconds, about 60 frames per second
+
+
+class FrameSubscription(object):
+    # A periodic callback of a FrameScheduler. It only runs between start() and stop(), so a subscriber that
+    # has nothing to draw costs nothing.
+    def __init__(self, scheduler, callback, interval=None):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.interval = interval  # milliseconds between two calls, None to run on every frame
+        self.is_active = False
+        self.last_call = None  # perf_counter time of the last call
+
+    def start(self):
+        if not self.is_active:
+            self.is_active = True
+            self.last_call = None  # run on the next frame
+        self.scheduler.wake()
+
+    def stop(self):
+        self.is_active = False
+
+    def cancel(self):
+        self.stop()
+        self.scheduler.unsubscribe(self)
+
+    def is_due(self, now):
+        if self.last_call is None or self.interval is None:
+            return True
+        # half a frame of slack, a 50 ms interval must not slip to every fourth 16 ms frame
+        return (now - self.last_call) * 1000 >= self.interval - self.scheduler.frame_interval / 2
+
+
+class FrameScheduler(object):
+    # One timer for all the periodic work of the application (playback, streamed views, the touchpad, the
+    # dragged responses): every due subscription runs in the same pass, once per frame, and the timer stops
+    # as soon as no subscription is active.
+    def __init__(self, frame_interval=FRAME_INTERVAL):
+        self.frame_interval = frame_interval
+        self._subscriptions = []
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.run_frame)
+
+    @property
+    def is_idle(self):
+        return not self._timer.isActive()
+
+    def subscribe(self, callback, interval=None, active=False):
+        subscription = FrameSubscription(self, callback, interval)
+        self._subscriptions.append(subscription)
+        if active:
+            subscription.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def wake(self):
+        if not self._timer.isActive():
+            self._timer.start(self.frame_interval)
+
+    def run_frame(self):
+        now = time.perf_counter()
+        probe.frame()
+        with probe.stage('frame'):
+            # a callback may start or cancel subscriptions
+            for subscription in list(self._subscriptions):
+                if subscription.is_active and subscription.is_due(now):
+                    subscription.last_call = now
+                    subscription.callback()
+        if not any(subscription.is_active for subscription in self._subscriptions):
+            self._timer.stop()
+
+
+_default_scheduler = None
+
+
+def default_scheduler():
+    # the scheduler shared by the widgets of the application, created on first use (after the QApplication)
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = FrameScheduler()
+    return _default_scheduler
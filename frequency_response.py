@@ -0,0 +1,199 @@
+import threading
+
+import numpy as np
+
+from instrumentation import probe
+
+# floor of |e^jw - r| so a root sitting on a grid frequency gives a large finite log instead of -inf
+_MIN_DISTANCE = 1e-300
+
+
+def _group_delay_terms(unit_circle, roots):
+    # Group delay of the factor (1 - r e^-jw) the OnlineFilter polynomials are made of (np.poly, powers of z^-1):
+    # 1 - d/dw arg(e^jw - r) = -Re(r / (e^jw - r)). A root on the unit circle gives 1/2 at every other
+    # frequency, which is also taken as its value at its own frequency instead of a division by zero.
+    roots = np.asarray(roots, dtype=complex).reshape(-1, 1)
+    factor = unit_circle - roots
+    ratio = np.divide(np.broadcast_to(roots, factor.shape), factor, out=np.full(factor.shape, -0.5 + 0j),
+                      where=factor != 0)
+    return -ratio.real
+
+
+def root_group_delay(roots, frequencies):
+    # (R, W) group delay in samples of each factor (1 - r z^-1) of a zeros/poles design
+    return _group_delay_terms(np.exp(1j * np.asarray(frequencies, dtype=float)), roots)
+
+
+def design_group_delay(zeros, poles, frequencies):
+    # group delay in samples of the filter the OnlineFilter applies, prod(1 - z_k z^-1) / prod(1 - p_k z^-1):
+    # the zero terms minus the pole terms. It differs from the delay of prod(e^jw - z) / prod(e^jw - p) by
+    # len(zeros) - len(poles) samples.
+    return root_group_delay(zeros, frequencies).sum(axis=0) - root_group_delay(poles, frequencies).sum(axis=0)
+
+
+class FrequencyResponse(object):
+    # Frequency response of a zeros/poles design on a fixed grid, H(e^jw) = prod(e^jw - z) / prod(e^jw - p)
+    # like freqz_zpk with k=1. The per root factors are cached as complex logs,
+    # log(e^jw - r) = log|e^jw - r| + j arg(e^jw - r), so the response is a sum of per root terms and moving one
+    # root only swaps its own term: O(W) per update however many roots are placed. The group delay is kept the
+    # same way, as a running sum of the closed form per root terms of root_group_delay. The phase and the group
+    # delay are the ones of the filter the OnlineFilter applies, in powers of z^-1: prod(1 - z e^-jw) /
+    # prod(1 - p e^-jw) = e^(-j (len(zeros) - len(poles)) w) H(e^jw), which adds a linear phase to freqz_zpk's.
+    RESYNC_UPDATES = 1000  # rebuild the running sum from the cached terms every that many updates
+
+    def __init__(self, worN=512):
+        # same grid as freqz_zpk(worN=512)
+        self.frequencies = np.linspace(0, np.pi, worN, endpoint=False)
+        self._unit_circle = np.exp(1j * self.frequencies)
+        self._zeros = []
+        self._poles = []
+        self._zero_terms = []
+        self._pole_terms = []
+        self._log_response = np.zeros(worN, dtype=complex)
+        self._zero_delays = []
+        self._pole_delays = []
+        self._group_delay = np.zeros(worN)
+        self._updates = 0
+
+    @property
+    def zeros(self):
+        return list(self._zeros)
+
+    @property
+    def poles(self):
+        return list(self._poles)
+
+    def _term(self, root):
+        factor = self._unit_circle - root
+        return np.log(np.maximum(np.abs(factor), _MIN_DISTANCE)) + 1j * np.angle(factor)
+
+    def _delay(self, root):
+        return _group_delay_terms(self._unit_circle, [root])[0]
+
+    def _resync(self):
+        self._log_response = np.zeros(len(self.frequencies), dtype=complex)
+        self._group_delay = np.zeros(len(self.frequencies))
+        for term, delay in zip(self._zero_terms, self._zero_delays):
+            self._log_response += term
+            self._group_delay += delay
+        for term, delay in zip(self._pole_terms, self._pole_delays):
+            self._log_response -= term
+            self._group_delay -= delay
+        self._updates = 0
+
+    def _count_update(self):
+        self._updates += 1
+        if self._updates >= self.RESYNC_UPDATES:
+            self._resync()
+
+    def set_roots(self, zeros, poles):
+        # Only the roots that differ from the current ones are recomputed, a changed number of roots rebuilds all
+        zeros = [complex(z) for z in zeros]
+        poles = [complex(p) for p in poles]
+        if len(zeros) != len(self._zeros) or len(poles) != len(self._poles):
+            self._zeros, self._poles = zeros, poles
+            self._zero_terms = [self._term(z) for z in zeros]
+            self._pole_terms = [self._term(p) for p in poles]
+            self._zero_delays = list(_group_delay_terms(self._unit_circle, zeros))
+            self._pole_delays = list(_group_delay_terms(self._unit_circle, poles))
+            self._resync()
+            return
+        for index, zero in enumerate(zeros):
+            if zero != self._zeros[index]:
+                self.move_zero(index, zero)
+        for index, pole in enumerate(poles):
+            if pole != self._poles[index]:
+                self.move_pole(index, pole)
+
+    def move_zero(self, index, zero):
+        term = self._term(zero)
+        self._log_response += term - self._zero_terms[index]
+        self._zero_terms[index] = term
+        delay = self._delay(zero)
+        self._group_delay += delay - self._zero_delays[index]
+        self._zero_delays[index] = delay
+        self._zeros[index] = complex(zero)
+        self._count_update()
+
+    def move_pole(self, index, pole):
+        term = self._term(pole)
+        self._log_response -= term - self._pole_terms[index]
+        self._pole_terms[index] = term
+        delay = self._delay(pole)
+        self._group_delay -= delay - self._pole_delays[index]
+        self._pole_delays[index] = delay
+        self._poles[index] = complex(pole)
+        self._count_update()
+
+    @property
+    def magnitude(self):
+        return np.exp(self._log_response.real)
+
+    @property
+    def phase(self):
+        # in powers of z^-1 like freqz(np.poly(zeros), np.poly(poles)), wrapped to (-pi, pi] like np.angle
+        delay = (len(self._zeros) - len(self._poles)) * self.frequencies
+        return np.angle(np.exp(1j * (self._log_response.imag - delay)))
+
+    @property
+    def group_delay(self):
+        # in samples, -d(phase)/dw of the phase above without unwrapping or differencing
+        return self._group_delay.copy()
+
+    @property
+    def response(self):
+        # freqz_zpk(zeros, poles, k=1), in powers of z
+        return np.exp(self._log_response)
+
+
+class ResponseWorker(object):
+    # Computes responses on a background thread. Only the newest request is kept: requests arriving while a
+    # response is computed replace each other, so a fast drag never piles up obsolete computations.
+    def __init__(self, worN=512):
+        self._response = FrequencyResponse(worN)  # owned by the worker thread
+        self._condition = threading.Condition()
+        self._request = None  # (version, zeros, poles) waiting to be computed
+        self._result = None  # (version, frequencies, magnitude, phase, group_delay) waiting to be taken
+        self._computing = False
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='response-worker', daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        with self._condition:
+            return self._request is not None or self._computing or self._result is not None
+
+    def request(self, version, zeros, poles):
+        with self._condition:
+            self._request = (version, list(zeros), list(poles))
+            self._condition.notify()
+
+    def take_result(self):
+        # newest finished response, or None
+        with self._condition:
+            result, self._result = self._result, None
+            return result
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                (version, zeros, poles), self._request = self._request, None
+                self._computing = True
+            with probe.stage('response.worker'):
+                self._response.set_roots(zeros, poles)
+                result = (version, self._response.frequencies, self._response.magnitude, self._response.phase,
+                          self._response.group_delay)
+            with self._condition:
+                self._result = result
+                self._computing = False
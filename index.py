@@ -1,23 +1,26 @@
+import argparse
+import importlib
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
-from PyQt5.QtCore import QTimer
 from ZPlane import ZPlaneSignalFilter
+from frame_scheduler import default_scheduler
 import pyqtgraph as pg
-import numpy as np
 import sys
-from pathlib import Path
-from res_rc import *  # Import the resource module
-import pandas as pd
-from PyQt5.uic import loadUiType
-import urllib.request
-import os
-from os import path
 import SignalViewer as sv
 from all_pass_filter import AllPassFilter, AllPassFilterFeature, OnlineFilter
-
-ui, _ = loadUiType('main.ui')
+from all_pass_optimizer import optimize_all_pass
+from filter_worker import FilterWorker
+from instrumentation import probe
+from touchpad import RollingWindow, TouchpadSource
+from main_ui import Ui_MainWindow  # compiled from main.ui by build_ui.py
+from signal_io import DEFAULT_SAMPLE_RATE, estimate_sample_rate, load_signal
+
+PLAYBACK_SPEEDS = {'1x': 1, '10x': 10, 'max': None}  # None plays the whole signal at once
+MOUSE_REST_TIME = 0.1  # seconds without a mouse move after which the touchpad stops generating
 def create_plot_widget(graphics_view, object_name="", bottom_label="", left_label="", signal_viewer_title=None,
                        signal_plot=None):
     widget = pg.PlotWidget(graphics_view)
@@ -38,17 +41,22 @@ def create_plot_widget(graphics_view, object_name="", bottom_label="", left_labe
     return widget, signal_viewer
 
 
-class MainApp(QMainWindow, ui):
-    def __init__(self, parent=None):
+class MainApp(QMainWindow, Ui_MainWindow):
+    def __init__(self, parent=None, profile_file=None):
         super(MainApp, self).__init__(parent)
         QMainWindow.__init__(self)
         self.setupUi(self)
         self.resize(1500, 900)
 
-        self.Timer = QTimer(self)
-        self.Timer.timeout.connect(self.draw_signal)
+        # all the periodic work (playback, touchpad, views, responses) runs from one frame scheduler
+        self.scheduler = default_scheduler()
+        self.playback = self.scheduler.subscribe(self.draw_signal, 50)
+        self.sample_rate = DEFAULT_SAMPLE_RATE
+        self.playback_speed = 1
+        self.playback_start = 0  # wall clock time at which the first sample was due
 
-        self.plotted_signal = []
+        self.plotted_signal = sv.MinMaxPyramid()
+        self.filtered_signal = sv.MinMaxPyramid()
         self.curr_sample_index = 0
         self.curr_sample = 0
         self.z_plane_signal_filter  = None
@@ -72,6 +80,11 @@ class MainApp(QMainWindow, ui):
             self.all_pass_real_listWidget.addItem(list_item1)
             self.all_pass_imag_listWidget.addItem(list_item2)
 
+        # the all-pass equalizer search runs on its own thread, the scheduler polls it until it is done
+        self.optimizer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='all-pass-optimizer')
+        self.optimizer_future = None
+        self.optimizer_poll = self.scheduler.subscribe(self.collect_optimized_all_pass, 100)
+
 
         # Objects : signal
 
@@ -98,13 +111,18 @@ class MainApp(QMainWindow, ui):
             "All Pass Phase Response"
         )
         self.magnitude_plot_widget, _ = create_plot_widget(
-            self.magnitude_response_view, "magnitude_response_plot_widget", "Frequency (Hz)", "Magnitude (degrees)",
+            self.magnitude_response_view, "magnitude_response_plot_widget", "Frequency (rad/sample)", "Magnitude",
             "Magnitude Response"
         )
+        # the phase and the group delay are the ones of the applied filter, in powers of z^-1
         self.phase_plot_widget, _ = create_plot_widget(
-            self.phase_response_view, "phase_response_plot_widget", "Frequency (Hz)", "Phase (degrees)",
+            self.phase_response_view, "phase_response_plot_widget", "Frequency (rad/sample)", "Phase (rad, z^-1)",
             "Phase Response"
         )
+        self.group_delay_plot_widget, _ = create_plot_widget(
+            self.group_delay_response_view, "group_delay_response_plot_widget", "Frequency (rad/sample)",
+            "Group Delay (samples, z^-1)", "Group Delay"
+        )
 
 #####################################################################################################################
         for i in range(len(self.unit_circle_graphics_views)):
@@ -125,7 +143,8 @@ class MainApp(QMainWindow, ui):
             if i == 0:
                 self.plot_widget.clear()
                 self.z_plane_signal_filter = ZPlaneSignalFilter(self.plot_widget, self.magnitude_plot_widget,
-                                                                self.phase_plot_widget, self.add_conjugates)
+                                                                self.phase_plot_widget, self.group_delay_plot_widget,
+                                                                self.add_conjugates)
             else:
                 self.all_pass_unit_circle_widget = self.plot_widget
             self.graphics_view_layout1 = QHBoxLayout(self.unit_circle_graphics_views[i])
@@ -142,21 +161,26 @@ class MainApp(QMainWindow, ui):
 
 
         self.verticalLayout_2.addWidget(self.view)
+        # touchpad signal and its filtered version, persistent curves fed from bounded rolling windows
         self.curve = self.unfiltered_plot_widget.plot(pen = "r")
-
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.updateGraph)
-        self.timer.start(50)  # Set the interval (milliseconds)
-        self.mouse_moving = False
+        self.touchpad_filtered_curve = self.filtered_plot_widget.plot(pen="r")
+        # Persistent curves of the opened signal, the viewers draw them from the min/max pyramids
+        self.signal_curve = pg.PlotDataItem()
+        self.filtered_signal_curve = pg.PlotDataItem()
+        self.unfiltered_signal_viewer.set_stream(self.plotted_signal, self.signal_curve)
+        self.filtered_signal_viewer.set_stream(self.filtered_signal, self.filtered_signal_curve)
+
+        # started by the mouse moves, stops itself once the mouse rests
+        self.touchpad = self.scheduler.subscribe(self.updateGraph, 50)
+        self.touchpad_source = TouchpadSource()
+        self.touchpad_signal = RollingWindow()
+        self.touchpad_filtered_signal = RollingWindow()
         # Initialize mouse position and previous position
         self.mouseX = 0
         self.mouseY = 0
         self.prevMouseX = 0
         self.prevMouseY = 0
-        self.t_x = 1
-        self.start_time=0
-        # Accumulated signal
-        self.accumulated_signal = []
+        self.t_x = time.time()
         self.view.mouseMoveEvent = self.mouseMoveEvent
         self.view.mousePressEvent = self.mousePressEvent
 
@@ -172,43 +196,102 @@ class MainApp(QMainWindow, ui):
         self.all_pass_real_listWidget.itemClicked.connect(self.handleItemClicked)
         self.all_pass_imag_listWidget.itemClicked.connect(self.handleItemClicked)
         self.import_btn.clicked.connect(self.open_signal)
+        self.speed_comboBox.currentTextChanged.connect(self.set_playback_speed)
         self.apply_all_pass_filter_btn.clicked.connect(self.apply_all_pass_filter)
-        self.online_filter = OnlineFilter(self.accumulated_signal, self.z_plane_signal_filter)
+        self.optimize_all_pass_btn.clicked.connect(self.optimize_all_pass_filter)
+        # timings of the hot paths shown over the signal views, and written to profile_file on exit
+        self.profile_file = profile_file
+        self.profile_overlay = self.scheduler.subscribe(self.update_profile_overlay, 500)
+        self.profile_checkBox.toggled.connect(self.toggle_profiling)
+        self.profile_checkBox.setChecked(profile_file is not None)
+        self.online_filter = OnlineFilter([], self.z_plane_signal_filter)
+        self.touchpad_filter_worker = FilterWorker(self.online_filter)
         self.online_filter2 = OnlineFilter([], self.z_plane_signal_filter)
+        # the played signal is filtered off the GUI thread, draw_signal only hands samples over
+        self.filter_worker = FilterWorker(self.online_filter2)
 
 
     def open_signal(self):
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getOpenFileName(self, 'Open Signal to Equalizer', '', '*.csv', options=options)
-        data = pd.read_csv(file_name).to_numpy().transpose()[1].tolist()
+        if not file_name:
+            return
+        with probe.stage('load'):
+            signal_time, data = load_signal(file_name)
+        self.sample_rate = estimate_sample_rate(signal_time, DEFAULT_SAMPLE_RATE)
+        self.clear_graph()
         self.online_filter2.signal = data
         self.online_filter2.all_pass_filters = self.filters
-        self.clear_graph()
-        self.Timer.start(50)  # Set the interval (milliseconds)
+        self.plotted_signal.reserve(len(data))
+        self.filtered_signal.reserve(len(data))
+        self.set_time_axis(self.sample_rate)
+        self.playback_start = time.time()
+        self.playback.start()
+
+    def set_time_axis(self, sample_rate):
+        # the opened file and the touchpad draw on the same views, the time axis follows the source drawn last
+        self.unfiltered_signal_viewer.sample_rate = sample_rate
+        self.filtered_signal_viewer.sample_rate = sample_rate
+
+    def set_playback_speed(self, text):
+        self.playback_speed = PLAYBACK_SPEEDS[text]
+        # carry on from the current sample at the new speed
+        if self.playback_speed is not None:
+            self.playback_start = time.time() - self.curr_sample_index / (self.sample_rate * self.playback_speed)
 
     def draw_signal(self):
+        # Hand every sample that is due by now at the playback speed to the filter worker in one block,
+        # and draw whatever it has filtered since the last frame
+        signal = self.online_filter2.signal
+        if self.playback_speed is None:
+            due = len(signal)
+        else:
+            elapsed = time.time() - self.playback_start
+            due = min(len(signal), int(elapsed * self.sample_rate * self.playback_speed) + 1)
+        # a file can wait, only feed what the worker has room for instead of dropping samples
+        due = min(due, self.curr_sample_index + self.filter_worker.free)
+        if due > self.curr_sample_index:
+            block = signal[self.curr_sample_index:due]
+            self.filter_worker.submit(block)
+            self.curr_sample_index = due
+            self.curr_sample = block[-1]
+            self.plotted_signal.extend(block)
+            self.unfiltered_signal_viewer.render_stream()
+        filtered = self.filter_worker.take()
+        if len(filtered) > 0:
+            self.filtered_signal.extend(filtered)
+            self.filtered_signal_viewer.render_stream()
+        if self.curr_sample_index >= len(signal) and self.filter_worker.pending == 0:
+            self.playback.stop()
+
+    def toggle_profiling(self, checked):
+        probe.enabled = checked
+        if checked:
+            self.profile_overlay.start()
+        else:
+            self.profile_overlay.stop()
+            self.unfiltered_signal_viewer.set_overlay(None)
+            self.filtered_signal_viewer.set_overlay(None)
 
-        if self.curr_sample_index < len(self.online_filter2.signal)-1:
-            self.filtered_plot_widget.clear()
-            self.unfiltered_plot_widget.clear()
-            self.curr_sample_index += 1
-            self.curr_sample = self.online_filter2.signal[self.curr_sample_index]
-            self.plotted_signal.append(self.curr_sample)
-            plot = pg.PlotDataItem(self.plotted_signal)
-            self.unfiltered_plot_widget.addItem(plot)
-            self.online_filter2.apply_filter()
-            plot = pg.PlotDataItem(self.online_filter2.filtered_signal)
-            self.filtered_plot_widget.addItem(plot)
+    def update_profile_overlay(self):
+        text = probe.overlay_text()
+        self.unfiltered_signal_viewer.set_overlay(text)
+        self.filtered_signal_viewer.set_overlay(f"{self.filter_worker.dropped_samples} dropped, "
+                                                f"{self.filter_worker.late_samples} late samples")
+
+    def closeEvent(self, event):
+        if self.profile_file is not None:
+            probe.dump(self.profile_file)
+        super().closeEvent(event)
 
     def show_all_pass_filter(self):
         checked_items = []
-        for i in range(len(self.all_pass_real_list)):
-            item1 = self.all_pass_real_listWidget.item(i)
-            item2 = self.all_pass_imag_listWidget.item(i)
-            if item1.checkState() == Qt.Checked:
-                checked_items.append(self.all_pass_real_list[i])
-            if item2.checkState() == Qt.Checked:
-                checked_items.append(self.all_pass_imag_list[i])
+        # the optimizer appends to either list, so they don't always have the same length
+        for coefficients, list_widget in ((self.all_pass_real_list, self.all_pass_real_listWidget),
+                                          (self.all_pass_imag_list, self.all_pass_imag_listWidget)):
+            for i in range(len(coefficients)):
+                if list_widget.item(i).checkState() == Qt.Checked:
+                    checked_items.append(coefficients[i])
         if self.all_pass_real_lineEdit.text() != "" and float(self.all_pass_real_lineEdit.text()) > 0:
             if self.all_pass_imag_lineEdit.text() != "":
                 checked_items.append(float(self.all_pass_real_lineEdit.text()) +
@@ -227,12 +310,48 @@ class MainApp(QMainWindow, ui):
         self.phase_plot_widget.clear()
         self.phase_plot_widget.addItem(self.feature.get_corrected_phase_plot(self.z_plane_signal_filter))
 
+    def optimize_all_pass_filter(self):
+        if self.optimizer_future is not None:
+            return
+        zeros, poles = self.z_plane_signal_filter.design_roots()
+        self.optimize_all_pass_btn.setEnabled(False)
+        self.optimizer_future = self.optimizer_executor.submit(optimize_all_pass, zeros, poles,
+                                                               self.optimize_stages_spinBox.value())
+        self.optimizer_poll.start()
+
+    def collect_optimized_all_pass(self):
+        # once the search is done, its stages replace the checked ones and are shown ready to apply
+        if not self.optimizer_future.done():
+            return
+        future, self.optimizer_future = self.optimizer_future, None
+        self.optimizer_poll.stop()
+        self.optimize_all_pass_btn.setEnabled(True)
+        result = future.result()
+        for list_widget in (self.all_pass_real_listWidget, self.all_pass_imag_listWidget):
+            for i in range(list_widget.count()):
+                list_widget.item(i).setCheckState(Qt.Unchecked)
+        self.all_pass_real_lineEdit.clear()
+        self.all_pass_imag_lineEdit.clear()
+        for a in result['coefficients']:
+            is_complex = isinstance(a, complex)
+            list_item = QListWidgetItem(f"a = {a:.4g}")
+            list_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
+            list_item.setCheckState(Qt.Checked)
+            (self.all_pass_imag_list if is_complex else self.all_pass_real_list).append(a)
+            (self.all_pass_imag_listWidget if is_complex else self.all_pass_real_listWidget).addItem(list_item)
+        self.optimize_all_pass_btn.setToolTip(f"Group delay std {result['initial_variation']:.4g} -> "
+                                              f"{result['variation']:.4g} samples over the passband")
+        self.show_all_pass_filter()
+
     def handleItemClicked(self, item):
         # Toggle the check state when an item is clicked
         current_state = item.checkState()
         item.setCheckState(Qt.Checked if current_state == Qt.Unchecked else Qt.Unchecked)
     def mousePressEvent(self, e):
-        self.start_time = time.time()
+        pos = e.pos()
+        self.mouseX = pos.x()
+        self.mouseY = pos.y()
+        self.t_x = time.time()
 
     def mouseMoveEvent(self, event):
         # Update mouse coordinates
@@ -241,44 +360,36 @@ class MainApp(QMainWindow, ui):
         self.prevMouseY = self.mouseY
         self.mouseX = pos.x()
         self.mouseY = pos.y()
-        self.t_x = time.time()
-        self.mouse_moving = True
+        # the horizontal speed sets the frequency of the generated signal
+        now = time.time()
+        delta_t = now - self.t_x
+        self.t_x = now
+        if delta_t > 0:
+            self.touchpad_source.set_velocity((self.mouseX - self.prevMouseX) / delta_t)
+        self.touchpad_source.resume(now)
+        if not self.touchpad.is_active:
+            self.set_time_axis(self.touchpad_source.sample_rate)
+        self.touchpad.start()
 
     def updateGraph(self):
-        if self.mouse_moving:
-            # Calculate the change in mouse coordinates
-            delta_x = self.mouseX - self.prevMouseX
-            # delta_y = self.mouseY - self.prevMouseY
-
-            # Calculate the distance moved
-            # distance = np.sqrt(delta_x ** 2 + delta_y ** 2)
-
-            # Calculate the amplitude of the signal based on the distance and direction
-            amplitude = 10  # Adjust the scaling factor as needed
-
-            # Determine the direction of movement
-            direction = np.sign(delta_x)  # Use the x-direction for simplicity
-
-            delta_t = time.time() - self.t_x
-            v = delta_x / delta_t if delta_t !=0 else 1
-            omega = np.abs(v/ amplitude)*0.01
-
-            curr_t = time.time()
-            x = lambda t: amplitude* np.cos(omega * t)
-            # print(delta_x, delta_t,amplitude,omega,x(curr_t-self.start_time))
-            print(omega)
-            # Accumulate the signal based on the movement
-            self.accumulated_signal.append(x(curr_t-self.start_time))
-
-            self.online_filter.signal = self.accumulated_signal
-
-            self.online_filter.apply_filter()
-            filtered_sig_plot = pg.PlotDataItem(self.online_filter.filtered_signal)
-            self.filtered_plot_widget.clear()
-            self.filtered_plot_widget.addItem(filtered_sig_plot)
-            # Update the plot
-            self.curve.setData(y=self.accumulated_signal)
-            self.mouse_moving = False
+        # Generate every sample due since the last tick while the mouse moves, filter it on the worker
+        # and draw the rolling windows
+        samples = self.touchpad_source.generate(time.time())
+        if len(samples) > 0:
+            self.touchpad_signal.extend(samples)
+            self.touchpad_filter_worker.submit(samples)
+            self.curve.setData(self.touchpad_signal.indices, self.touchpad_signal.data)
+        filtered = self.touchpad_filter_worker.take()
+        if len(filtered) > 0:
+            self.touchpad_filtered_signal.extend(filtered)
+            self.touchpad_filtered_curve.setData(self.touchpad_filtered_signal.indices,
+                                                 self.touchpad_filtered_signal.data)
+        if time.time() - self.t_x > MOUSE_REST_TIME:
+            # the mouse rests, no samples until it moves again
+            self.touchpad_source.pause()
+            if self.touchpad_filter_worker.pending == 0:
+                self.touchpad.stop()
+
     def toggle_side_bar(self):
         if self.all_pass_radioButton.isChecked():
             # for slide activate_slider and disable the other buttons
@@ -292,18 +403,29 @@ class MainApp(QMainWindow, ui):
         self.animation.start()
         self.right_frame.update()
     def clear_graph(self):
-        self.plotted_signal = []
+        self.plotted_signal.clear()
+        self.filtered_signal.clear()
         self.curr_sample_index = 0
         self.curr_sample = 0
-        self.Timer.stop()
+        self.playback.stop()
         self.unfiltered_plot_widget.clear()
         self.filtered_plot_widget.clear()
+        self.unfiltered_signal_viewer.set_stream(self.plotted_signal, self.signal_curve)
+        self.filtered_signal_viewer.set_stream(self.filtered_signal, self.filtered_signal_curve)
 
+        self.touchpad_filter_worker.stop()
         self.online_filter.reset()
+        self.touchpad_filter_worker.reset()
+        # the worker thread must not run while its filter is reset
+        self.filter_worker.stop()
         self.online_filter2.reset()
+        self.filter_worker.reset()
 
         self.curve = self.unfiltered_plot_widget.plot(pen='r')
-        self.accumulated_signal = []
+        self.touchpad_filtered_curve = self.filtered_plot_widget.plot(pen='r')
+        self.touchpad_source.reset()
+        self.touchpad_signal.clear()
+        self.touchpad_filtered_signal.clear()
 
     def clear_all_pass_graph(self):
         self.all_pass_phase_plot_widget.clear()
@@ -311,10 +433,27 @@ class MainApp(QMainWindow, ui):
 
 
 
+# imported lazily by the filters and responses, scipy.signal takes about a second to import
+PRELOADED_MODULES = ('scipy.signal',)
+
+
+def preload_modules():
+    # Import them on a background thread once the window is up, so the first block the FilterWorker filters
+    # doesn't stall on the import (and every sample behind it isn't counted as late)
+    def run():
+        for name in PRELOADED_MODULES:
+            importlib.import_module(name)
+    threading.Thread(target=run, name='preload', daemon=True).start()
+
+
 def main():
-    app = QApplication(sys.argv)
-    window = MainApp()
+    parser = argparse.ArgumentParser(description='Realtime digital filter design')
+    parser.add_argument('--profile', metavar='FILE', help='time the hot paths from the start and write them to FILE on exit')
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainApp(profile_file=args.profile)
     window.show()
+    QTimer.singleShot(0, preload_modules)
     app.exec_()
 
 
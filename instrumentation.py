@@ -0,0 +1,144 @@
+# Timing of the hot paths (filtering, responses, redraws, signal loading): per stage duration histograms,
+# frames per second and filtered samples per second. Disabled, a measured call costs one flag test.
+#
+#   with probe.stage('filter.block'):
+#       ...
+#   probe.count_samples(len(block))
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# histogram bins of the stage durations, 4 per decade from 1 us to 1 s, plus under/overflow bins
+BIN_EDGES = [10 ** (exponent / 4) for exponent in range(-24, 1)]
+RATE_WINDOW = 1.0  # seconds the frame and sample rates are averaged over
+
+_DISABLED = nullcontext()
+
+
+class StageStats(object):
+    # a stage may be timed from several threads at once (e.g. the two filter workers)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BIN_EDGES) + 1)
+
+    def add(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self.histogram[bisect.bisect(BIN_EDGES, seconds)] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        # upper edge of the bin holding the q-th percentile, the resolution of the histogram
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return min(BIN_EDGES[index], self.max) if index < len(BIN_EDGES) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'mean': self.mean, 'max': self.max,
+                'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99),
+                'histogram': self.histogram}
+
+
+class _StageTimer(object):
+    # one per measurement, so concurrent measurements of a stage keep their own start
+    __slots__ = ('stats', 'start')
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.stats.add(time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation(object):
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self._stages = {}
+        self._frames = deque(maxlen=1000)  # frame times
+        self._samples = deque(maxlen=1000)  # (time, count) of the filtered blocks
+        self.total_samples = 0
+        self.started = time.perf_counter()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _DISABLED
+        stats = self._stages.get(name)
+        if stats is None:
+            stats = self._stages.setdefault(name, StageStats())
+        return _StageTimer(stats)
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self._stages.setdefault(name, StageStats()).add(seconds)
+
+    def frame(self):
+        if self.enabled:
+            self._frames.append(time.perf_counter())
+
+    def count_samples(self, count):
+        if self.enabled:
+            self._samples.append((time.perf_counter(), count))
+            self.total_samples += count
+
+    @property
+    def stages(self):
+        return dict(self._stages)
+
+    @property
+    def fps(self):
+        now = time.perf_counter()
+        frames = [t for t in list(self._frames) if now - t <= RATE_WINDOW]
+        if len(frames) < 2:
+            return 0.0
+        return (len(frames) - 1) / (frames[-1] - frames[0])
+
+    @property
+    def samples_per_second(self):
+        now = time.perf_counter()
+        return sum(count for t, count in list(self._samples) if now - t <= RATE_WINDOW) / RATE_WINDOW
+
+    def summary(self):
+        return {'seconds': time.perf_counter() - self.started, 'fps': self.fps,
+                'samples_per_second': self.samples_per_second, 'total_samples': self.total_samples,
+                'bin_edges': BIN_EDGES, 'stages': {name: stats.to_dict() for name, stats in self.stages.items()}}
+
+    def overlay_text(self):
+        lines = [f"{self.fps:5.1f} fps  {self.samples_per_second:9.0f} samples/s"]
+        for name, stats in sorted(self.stages.items()):
+            lines.append(f"{name:<18} n={stats.count:<7} mean={stats.mean * 1e3:7.3f} ms  "
+                         f"p99={stats.percentile(99) * 1e3:7.3f} ms  max={stats.max * 1e3:7.3f} ms")
+        return '\n'.join(lines)
+
+    def dump(self, filename):
+        with open(filename, 'w') as output:
+            json.dump(self.summary(), output, indent=2)
+
+
+# the instrumentation shared by the whole application
+probe = Instrumentation()
@@ -0,0 +1,615 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'main.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1234, 801)
+        MainWindow.setStyleSheet("QWidget {\n"
+"  background-color: #19232D;\n"
+"  border: 0px solid #455364;\n"
+"  padding: 0px;\n"
+"  color: white;\n"
+"  selection-background-color: #346792;\n"
+"  selection-color: #E0E1E3;\n"
+"    font-family : Ubuntu;\n"
+"font-size: 18px;\n"
+"font-weight: bold;\n"
+"}\n"
+"\n"
+"QWidget:disabled {\n"
+"  background-color: #19232D;\n"
+"  color: #9DA9B5;\n"
+"  selection-background-color: #26486B;\n"
+"  selection-color: #9DA9B5;\n"
+"}\n"
+"\n"
+"QWidget::item:selected {\n"
+"  background-color: #176B87;\n"
+"}\n"
+"\n"
+"QWidget::item:hover:!selected {\n"
+"  background-color: rgba(23, 107, 135,50%);\n"
+"}\n"
+"\n"
+"QMainWindow::separator {\n"
+"  background-color: #455364;\n"
+"  border: 0px solid #19232D;\n"
+"  spacing: 0px;\n"
+"  padding: 2px;\n"
+"}\n"
+"\n"
+"QMainWindow::separator:hover {\n"
+"  background-color: #60798B;\n"
+"  border: 0px solid #1A72BB;\n"
+"}\n"
+"\n"
+"/*-------------------------------------------------------------------------------------------*/\n"
+"\n"
+"QCheckBox {\n"
+"  background-color: rgb(0,0,0,0);\n"
+"  color: white;\n"
+"  spacing: 4px;\n"
+"  outline: none;\n"
+"  padding-top: 2px;\n"
+"\n"
+"}\n"
+"\n"
+"\n"
+"/*-------------------------------------------------------------------------------------------*/\n"
+"QScrollBar:horizontal {\n"
+"  height: 16px;\n"
+"  margin: 2px 16px 2px 16px;\n"
+"  border: 1px solid white;\n"
+"  border-radius: 4px;\n"
+"  background-color: rgb(25, 35, 45);\n"
+"}\n"
+"\n"
+"QScrollBar::handle:horizontal {\n"
+"  background-color: #176B87;\n"
+"  border: 1px solid #C9CDD0;\n"
+"  border-radius: 4px;\n"
+"  min-width: 8px;\n"
+"}\n"
+"\n"
+"QScrollBar::handle:horizontal:hover {\n"
+"  background-color: rgba(23, 107, 135,80%);\n"
+"  border:#4169E1;\n"
+"  border-radius: 4px;\n"
+"  min-width: 8px;\n"
+"}\n"
+"\n"
+"QScrollBar::handle:horizontal:focus {\n"
+"  border: 1px solid red;\n"
+"}\n"
+"QScrollBar:vertical {\n"
+"  background-color: rgb(25, 35, 45);\n"
+"  width: 16px;\n"
+"  margin: 16px 2px 16px 2px;\n"
+"  border: 1px solid white;\n"
+"  border-radius: 4px;\n"
+"}\n"
+"\n"
+"\n"
+"QScrollBar::handle:vertical {\n"
+"  background-color: #176B87;\n"
+"  border: 1px solid #C9CDD0;\n"
+"  min-height: 8px;\n"
+"  border-radius: 4px;\n"
+"}\n"
+"\n"
+"QScrollBar::handle:vertical:hover {\n"
+"  background-color: rgba(23, 107, 135,80%);\n"
+"  border: #9FCBFF;\n"
+"  border-radius: 4px;\n"
+"  min-height: 8px;\n"
+"}\n"
+"\n"
+"QScrollBar::handle:vertical:focus {\n"
+"  border: 1px solid #73C7FF;\n"
+"}\n"
+"\n"
+"\n"
+"QScrollBar::add-line:horizontal {\n"
+"  margin: 0px 0px 0px 0px;\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_right_disabled.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: right;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::add-line:horizontal:hover, QScrollBar::add-line:horizontal:on {\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_right.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: right;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::add-line:vertical {\n"
+"  margin: 3px 0px 3px 0px;\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_down_disabled.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: bottom;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::add-line:vertical:hover, QScrollBar::add-line:vertical:on {\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_down.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: bottom;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::sub-line:horizontal {\n"
+"  margin: 0px 3px 0px 3px;\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_left_disabled.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: left;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::sub-line:horizontal:hover, QScrollBar::sub-line:horizontal:on {\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_left.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: left;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::sub-line:vertical {\n"
+"  margin: 3px 0px 3px 0px;\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_up_disabled.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: top;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::sub-line:vertical:hover, QScrollBar::sub-line:vertical:on {\n"
+"  border-image: url(\"qss_icons/light/rc/arrow_up.png\");\n"
+"  height: 12px;\n"
+"  width: 12px;\n"
+"  subcontrol-position: top;\n"
+"  subcontrol-origin: margin;\n"
+"}\n"
+"\n"
+"QScrollBar::up-arrow:horizontal, QScrollBar::down-arrow:horizontal {\n"
+"  background: none;\n"
+"}\n"
+"\n"
+"QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical {\n"
+"  background: none;\n"
+"}\n"
+"\n"
+"\n"
+"QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {\n"
+"  background: none;\n"
+"}\n"
+"\n"
+"QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {\n"
+"  background: none;\n"
+"}\n"
+"\n"
+"/*----------------------------------------------------------------------------------------*/\n"
+"QPushButton{\n"
+" /*border:2px solid #05B8CC;*/\n"
+" background-color: #176B87;\n"
+"padding: 3px 10px;\n"
+" color:rgb(255, 255, 255);\n"
+" border-radius: 10px;\n"
+" font-weight:bold;\n"
+"  margin: 5px;\n"
+"}\n"
+"\n"
+"QPushButton::hover{\n"
+" border: 1px solid #176B87;\n"
+" background-color: rgba(23, 107, 135,80%)\n"
+"}\n"
+"QPushButton:pressed {\n"
+" margin:1px 2px;\n"
+" font-size: 15px;\n"
+"}\n"
+"/*----------------------------------------------------------------------------------------*/\n"
+"QComboBox{\n"
+" border:1px solid #176B87;\n"
+"border-radius:5px;\n"
+"background-color: #176B87;\n"
+"padding: 2px 10px;\n"
+"color:white;\n"
+"}\n"
+"\n"
+"\n"
+"\n"
+"QComboBox:on { /* shift the text when the popup opens */\n"
+"    padding-top: 3px;\n"
+"    padding-left: 4px;\n"
+"}\n"
+"\n"
+"\n"
+"QComboBox::drop-down {\n"
+"    subcontrol-origin: padding;\n"
+"    subcontrol-position: top right;\n"
+"    width: 22px;\n"
+"\n"
+"    border-left-width: 1px;\n"
+"    border-left-color: darkgray;\n"
+"    border-left-style: solid; /* just a single line */\n"
+"    border-top-right-radius: 3px; /* same radius as the QComboBox */\n"
+"    border-bottom-right-radius: 3px;\n"
+"}\n"
+"\n"
+"QComboBox::down-arrow {\n"
+"    image: url(icons/caret-down copy.svg);\n"
+"}\n"
+"\n"
+"QComboBox::down-arrow:on { /* shift the arrow when popup is open */\n"
+"    top: 1px;\n"
+"    left: 1px;\n"
+"}\n"
+"QComboBox QAbstractItemView {\n"
+"border:none;\n"
+"    selection-background-color:#176B87;\n"
+"}\n"
+"/*---------------------------------------------------------------------------------------*/\n"
+"QProgressBar{\n"
+"    border: 1px solid #05B8CC;\n"
+"    border-radius:5px;\n"
+"    text-align:center;\n"
+"    font-size:18px;\n"
+"}\n"
+"\n"
+"QProgressBar::chunk{\n"
+"    background-color: #05B8CC;\n"
+"    width: 17px;\n"
+"    margin: 0.5px;\n"
+"}")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout.setContentsMargins(0, 0, 0, 5)
+        self.gridLayout.setSpacing(0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.main_frame = QtWidgets.QFrame(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.main_frame.sizePolicy().hasHeightForWidth())
+        self.main_frame.setSizePolicy(sizePolicy)
+        self.main_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.main_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.main_frame.setObjectName("main_frame")
+        self.verticalLayout_8 = QtWidgets.QVBoxLayout(self.main_frame)
+        self.verticalLayout_8.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
+        self.verticalLayout_8.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_8.setSpacing(0)
+        self.verticalLayout_8.setObjectName("verticalLayout_8")
+        self.upper_frame = QtWidgets.QFrame(self.main_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.upper_frame.sizePolicy().hasHeightForWidth())
+        self.upper_frame.setSizePolicy(sizePolicy)
+        self.upper_frame.setMinimumSize(QtCore.QSize(0, 37))
+        self.upper_frame.setMaximumSize(QtCore.QSize(16777215, 62))
+        self.upper_frame.setStyleSheet("")
+        self.upper_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.upper_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.upper_frame.setObjectName("upper_frame")
+        self.gridLayout_4 = QtWidgets.QGridLayout(self.upper_frame)
+        self.gridLayout_4.setContentsMargins(0, 0, 12, 0)
+        self.gridLayout_4.setSpacing(0)
+        self.gridLayout_4.setObjectName("gridLayout_4")
+        self.all_pass_radioButton = QtWidgets.QRadioButton(self.upper_frame)
+        self.all_pass_radioButton.setObjectName("all_pass_radioButton")
+        self.gridLayout_4.addWidget(self.all_pass_radioButton, 0, 1, 1, 1)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout_4.addItem(spacerItem, 0, 0, 1, 1)
+        self.verticalLayout_8.addWidget(self.upper_frame)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setSpacing(0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.left_frame = QtWidgets.QFrame(self.main_frame)
+        self.left_frame.setStyleSheet("")
+        self.left_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.left_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.left_frame.setObjectName("left_frame")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.left_frame)
+        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout.setSpacing(0)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.left_upper_frame = QtWidgets.QFrame(self.left_frame)
+        self.left_upper_frame.setStyleSheet("")
+        self.left_upper_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.left_upper_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.left_upper_frame.setObjectName("left_upper_frame")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.left_upper_frame)
+        self.gridLayout_2.setContentsMargins(5, 0, -1, 0)
+        self.gridLayout_2.setHorizontalSpacing(0)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.unite_circle = QtWidgets.QGraphicsView(self.left_upper_frame)
+        self.unite_circle.setStyleSheet("")
+        self.unite_circle.setObjectName("unite_circle")
+        self.verticalLayout_3.addWidget(self.unite_circle)
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.add_conjugates = QtWidgets.QCheckBox(self.left_upper_frame)
+        self.add_conjugates.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.add_conjugates.setObjectName("add_conjugates")
+        self.horizontalLayout_2.addWidget(self.add_conjugates)
+        self.clear_zeros_btn = QtWidgets.QPushButton(self.left_upper_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.clear_zeros_btn.sizePolicy().hasHeightForWidth())
+        self.clear_zeros_btn.setSizePolicy(sizePolicy)
+        self.clear_zeros_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap("icons/bin.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.clear_zeros_btn.setIcon(icon)
+        self.clear_zeros_btn.setIconSize(QtCore.QSize(30, 30))
+        self.clear_zeros_btn.setObjectName("clear_zeros_btn")
+        self.horizontalLayout_2.addWidget(self.clear_zeros_btn)
+        self.clear_poles_btn = QtWidgets.QPushButton(self.left_upper_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.clear_poles_btn.sizePolicy().hasHeightForWidth())
+        self.clear_poles_btn.setSizePolicy(sizePolicy)
+        self.clear_poles_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.clear_poles_btn.setIcon(icon)
+        self.clear_poles_btn.setIconSize(QtCore.QSize(30, 30))
+        self.clear_poles_btn.setObjectName("clear_poles_btn")
+        self.horizontalLayout_2.addWidget(self.clear_poles_btn)
+        self.clear_all_btn = QtWidgets.QPushButton(self.left_upper_frame)
+        self.clear_all_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.clear_all_btn.setIcon(icon)
+        self.clear_all_btn.setIconSize(QtCore.QSize(30, 30))
+        self.clear_all_btn.setObjectName("clear_all_btn")
+        self.horizontalLayout_2.addWidget(self.clear_all_btn)
+        self.verticalLayout_3.addLayout(self.horizontalLayout_2)
+        self.gridLayout_2.addLayout(self.verticalLayout_3, 0, 0, 1, 1)
+        self.verticalLayout.addWidget(self.left_upper_frame)
+        self.left_lower_frame = QtWidgets.QFrame(self.left_frame)
+        self.left_lower_frame.setStyleSheet("")
+        self.left_lower_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.left_lower_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.left_lower_frame.setObjectName("left_lower_frame")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.left_lower_frame)
+        self.gridLayout_3.setContentsMargins(5, 10, -1, 0)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.import_btn = QtWidgets.QPushButton(self.left_lower_frame)
+        self.import_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap("icons/open-folder.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.import_btn.setIcon(icon1)
+        self.import_btn.setIconSize(QtCore.QSize(30, 30))
+        self.import_btn.setObjectName("import_btn")
+        self.horizontalLayout_3.addWidget(self.import_btn)
+        spacerItem1 = QtWidgets.QSpacerItem(27, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem1)
+        self.speed_comboBox = QtWidgets.QComboBox(self.left_lower_frame)
+        self.speed_comboBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.speed_comboBox.setObjectName("speed_comboBox")
+        self.speed_comboBox.addItem("")
+        self.speed_comboBox.addItem("")
+        self.speed_comboBox.addItem("")
+        self.horizontalLayout_3.addWidget(self.speed_comboBox)
+        self.profile_checkBox = QtWidgets.QCheckBox(self.left_lower_frame)
+        self.profile_checkBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.profile_checkBox.setObjectName("profile_checkBox")
+        self.horizontalLayout_3.addWidget(self.profile_checkBox)
+        self.clear_btn = QtWidgets.QPushButton(self.left_lower_frame)
+        self.clear_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.clear_btn.setIcon(icon)
+        self.clear_btn.setIconSize(QtCore.QSize(30, 30))
+        self.clear_btn.setObjectName("clear_btn")
+        self.horizontalLayout_3.addWidget(self.clear_btn)
+        self.verticalLayout_2.addLayout(self.horizontalLayout_3)
+        self.gridLayout_3.addLayout(self.verticalLayout_2, 0, 0, 1, 1)
+        self.verticalLayout.addWidget(self.left_lower_frame)
+        self.horizontalLayout.addWidget(self.left_frame)
+        self.middel_frame = QtWidgets.QFrame(self.main_frame)
+        self.middel_frame.setStyleSheet("")
+        self.middel_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.middel_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.middel_frame.setObjectName("middel_frame")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.middel_frame)
+        self.verticalLayout_6.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_6.setSpacing(0)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.frame_7 = QtWidgets.QFrame(self.middel_frame)
+        self.frame_7.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_7.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_7.setObjectName("frame_7")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.frame_7)
+        self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_5.setSpacing(7)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.magnitude_response_view = QtWidgets.QGraphicsView(self.frame_7)
+        self.magnitude_response_view.setStyleSheet("")
+        self.magnitude_response_view.setObjectName("magnitude_response_view")
+        self.verticalLayout_5.addWidget(self.magnitude_response_view)
+        self.phase_response_view = QtWidgets.QGraphicsView(self.frame_7)
+        self.phase_response_view.setStyleSheet("")
+        self.phase_response_view.setObjectName("phase_response_view")
+        self.verticalLayout_5.addWidget(self.phase_response_view)
+        self.group_delay_response_view = QtWidgets.QGraphicsView(self.frame_7)
+        self.group_delay_response_view.setStyleSheet("")
+        self.group_delay_response_view.setObjectName("group_delay_response_view")
+        self.verticalLayout_5.addWidget(self.group_delay_response_view)
+        self.verticalLayout_6.addWidget(self.frame_7)
+        self.frame_8 = QtWidgets.QFrame(self.middel_frame)
+        self.frame_8.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_8.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_8.setObjectName("frame_8")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.frame_8)
+        self.verticalLayout_4.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_4.setSpacing(0)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.unfiltered_signal_view = QtWidgets.QGraphicsView(self.frame_8)
+        self.unfiltered_signal_view.setMinimumSize(QtCore.QSize(0, 160))
+        self.unfiltered_signal_view.setStyleSheet("")
+        self.unfiltered_signal_view.setObjectName("unfiltered_signal_view")
+        self.verticalLayout_4.addWidget(self.unfiltered_signal_view)
+        self.filtered_signal_view = QtWidgets.QGraphicsView(self.frame_8)
+        self.filtered_signal_view.setMinimumSize(QtCore.QSize(0, 160))
+        self.filtered_signal_view.setStyleSheet("")
+        self.filtered_signal_view.setObjectName("filtered_signal_view")
+        self.verticalLayout_4.addWidget(self.filtered_signal_view)
+        self.verticalLayout_6.addWidget(self.frame_8)
+        self.horizontalLayout.addWidget(self.middel_frame)
+        self.right_frame = QtWidgets.QFrame(self.main_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.right_frame.sizePolicy().hasHeightForWidth())
+        self.right_frame.setSizePolicy(sizePolicy)
+        self.right_frame.setMaximumSize(QtCore.QSize(0, 16777215))
+        self.right_frame.setStyleSheet("")
+        self.right_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.right_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.right_frame.setObjectName("right_frame")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.right_frame)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.all_pass_real_listWidget = QtWidgets.QListWidget(self.right_frame)
+        self.all_pass_real_listWidget.viewport().setProperty("cursor", QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.all_pass_real_listWidget.setStyleSheet("border: 2px solid #176B87; \n"
+"border-radius: 10px;")
+        self.all_pass_real_listWidget.setObjectName("all_pass_real_listWidget")
+        self.horizontalLayout_7.addWidget(self.all_pass_real_listWidget)
+        self.all_pass_imag_listWidget = QtWidgets.QListWidget(self.right_frame)
+        self.all_pass_imag_listWidget.viewport().setProperty("cursor", QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.all_pass_imag_listWidget.setStyleSheet("border: 2px solid #176B87; \n"
+"border-radius: 10px;\n"
+"")
+        self.all_pass_imag_listWidget.setObjectName("all_pass_imag_listWidget")
+        self.horizontalLayout_7.addWidget(self.all_pass_imag_listWidget)
+        self.verticalLayout_7.addLayout(self.horizontalLayout_7)
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.label_2 = QtWidgets.QLabel(self.right_frame)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout_4.addWidget(self.label_2)
+        self.all_pass_real_lineEdit = QtWidgets.QLineEdit(self.right_frame)
+        self.all_pass_real_lineEdit.setStyleSheet("background-color: rgb(255, 255, 255);\n"
+"color: rgb(0,0,0);\n"
+"border: 2px solid #176B87; \n"
+"border-radius: 10px;")
+        self.all_pass_real_lineEdit.setMaxLength(5)
+        self.all_pass_real_lineEdit.setAlignment(QtCore.Qt.AlignCenter)
+        self.all_pass_real_lineEdit.setObjectName("all_pass_real_lineEdit")
+        self.horizontalLayout_4.addWidget(self.all_pass_real_lineEdit)
+        self.label_3 = QtWidgets.QLabel(self.right_frame)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout_4.addWidget(self.label_3)
+        self.all_pass_imag_lineEdit = QtWidgets.QLineEdit(self.right_frame)
+        self.all_pass_imag_lineEdit.setStyleSheet("background-color: rgb(255, 255, 255);\n"
+"color: rgb(0,0,0);\n"
+"border: 2px solid #176B87; \n"
+"border-radius: 10px;\n"
+"")
+        self.all_pass_imag_lineEdit.setMaxLength(5)
+        self.all_pass_imag_lineEdit.setCursorPosition(0)
+        self.all_pass_imag_lineEdit.setAlignment(QtCore.Qt.AlignCenter)
+        self.all_pass_imag_lineEdit.setClearButtonEnabled(False)
+        self.all_pass_imag_lineEdit.setObjectName("all_pass_imag_lineEdit")
+        self.horizontalLayout_4.addWidget(self.all_pass_imag_lineEdit)
+        self.label_4 = QtWidgets.QLabel(self.right_frame)
+        self.label_4.setObjectName("label_4")
+        self.horizontalLayout_4.addWidget(self.label_4)
+        self.show_all_pass_filter_btn = QtWidgets.QPushButton(self.right_frame)
+        self.show_all_pass_filter_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.show_all_pass_filter_btn.setObjectName("show_all_pass_filter_btn")
+        self.horizontalLayout_4.addWidget(self.show_all_pass_filter_btn)
+        self.verticalLayout_7.addLayout(self.horizontalLayout_4)
+        self.all_pass_unite_circle = QtWidgets.QGraphicsView(self.right_frame)
+        self.all_pass_unite_circle.setStyleSheet("")
+        self.all_pass_unite_circle.setObjectName("all_pass_unite_circle")
+        self.verticalLayout_7.addWidget(self.all_pass_unite_circle)
+        self.all_pass_phase_response = QtWidgets.QGraphicsView(self.right_frame)
+        self.all_pass_phase_response.setStyleSheet("")
+        self.all_pass_phase_response.setObjectName("all_pass_phase_response")
+        self.verticalLayout_7.addWidget(self.all_pass_phase_response)
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.apply_all_pass_filter_btn = QtWidgets.QPushButton(self.right_frame)
+        self.apply_all_pass_filter_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.apply_all_pass_filter_btn.setObjectName("apply_all_pass_filter_btn")
+        self.horizontalLayout_6.addWidget(self.apply_all_pass_filter_btn)
+        self.optimize_all_pass_btn = QtWidgets.QPushButton(self.right_frame)
+        self.optimize_all_pass_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.optimize_all_pass_btn.setObjectName("optimize_all_pass_btn")
+        self.horizontalLayout_6.addWidget(self.optimize_all_pass_btn)
+        self.optimize_stages_spinBox = QtWidgets.QSpinBox(self.right_frame)
+        self.optimize_stages_spinBox.setMinimum(1)
+        self.optimize_stages_spinBox.setMaximum(10)
+        self.optimize_stages_spinBox.setProperty("value", 4)
+        self.optimize_stages_spinBox.setObjectName("optimize_stages_spinBox")
+        self.horizontalLayout_6.addWidget(self.optimize_stages_spinBox)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_6.addItem(spacerItem2)
+        self.clear_all_pass_filter_btn = QtWidgets.QPushButton(self.right_frame)
+        self.clear_all_pass_filter_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.clear_all_pass_filter_btn.setIconSize(QtCore.QSize(30, 30))
+        self.clear_all_pass_filter_btn.setObjectName("clear_all_pass_filter_btn")
+        self.horizontalLayout_6.addWidget(self.clear_all_pass_filter_btn)
+        self.verticalLayout_7.addLayout(self.horizontalLayout_6)
+        self.horizontalLayout.addWidget(self.right_frame)
+        self.horizontalLayout.setStretch(0, 1)
+        self.horizontalLayout.setStretch(1, 2)
+        self.horizontalLayout.setStretch(2, 2)
+        self.verticalLayout_8.addLayout(self.horizontalLayout)
+        self.gridLayout.addWidget(self.main_frame, 0, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Filter Designer"))
+        self.all_pass_radioButton.setText(_translate("MainWindow", "All Pass Filter"))
+        self.add_conjugates.setText(_translate("MainWindow", "Add Conjugates"))
+        self.clear_zeros_btn.setText(_translate("MainWindow", " Zeros"))
+        self.clear_poles_btn.setText(_translate("MainWindow", "Poles"))
+        self.clear_all_btn.setText(_translate("MainWindow", "All"))
+        self.import_btn.setText(_translate("MainWindow", "Import "))
+        self.speed_comboBox.setToolTip(_translate("MainWindow", "Playback speed"))
+        self.speed_comboBox.setItemText(0, _translate("MainWindow", "1x"))
+        self.speed_comboBox.setItemText(1, _translate("MainWindow", "10x"))
+        self.speed_comboBox.setItemText(2, _translate("MainWindow", "max"))
+        self.profile_checkBox.setToolTip(_translate("MainWindow", "Time the filtering, responses and redraws and show the figures over the signal views"))
+        self.profile_checkBox.setText(_translate("MainWindow", "Profile"))
+        self.clear_btn.setText(_translate("MainWindow", "Clear"))
+        self.label_2.setText(_translate("MainWindow", "a = "))
+        self.label_3.setText(_translate("MainWindow", "+"))
+        self.label_4.setText(_translate("MainWindow", "j"))
+        self.show_all_pass_filter_btn.setText(_translate("MainWindow", "Show All Pass Filter"))
+        self.apply_all_pass_filter_btn.setText(_translate("MainWindow", "Apply All Pass Filter"))
+        self.optimize_all_pass_btn.setToolTip(_translate("MainWindow", "Search all-pass stages flattening the group delay over the passband of the design"))
+        self.optimize_all_pass_btn.setText(_translate("MainWindow", "Optimize"))
+        self.optimize_stages_spinBox.setToolTip(_translate("MainWindow", "Number of all-pass stages"))
+        self.clear_all_pass_filter_btn.setText(_translate("MainWindow", "Clear"))
@@ -0,0 +1,215 @@
+# Headless reports of filtered recordings: the signal, magnitude and phase plots rendered offscreen with
+# pyqtgraph.exporters and the statistics of the original and filtered signals, as one PDF or PNG page per file
+# usage: python -m report design.json files/ --output-dir reports/ [--format png]
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pyqtgraph as pg
+import pyqtgraph.exporters
+from PyQt5.QtCore import QMarginsF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPageSize, QPainter, QPdfWriter
+from PyQt5.QtWidgets import QApplication
+
+import SignalViewer as sv
+from all_pass_filter import OnlineFilter
+from batch import collect_inputs, create_filter
+from filter_design import FilterDesign
+from frequency_response import FrequencyResponse
+from signal_io import DEFAULT_SAMPLE_RATE, StatisticsAccumulator, estimate_sample_rate, iter_signal_chunks
+
+PAGE_WIDTH, PAGE_HEIGHT = 1240, 1754  # A4 at 150 dpi, the layout units of a page and the size of the PNG reports
+RESOLUTION = 150  # dpi of the PDF reports
+MARGIN = 60
+PLOT_WIDTH, PLOT_HEIGHT = PAGE_WIDTH - 2 * MARGIN, 400
+STATISTICS = ['samples', 'mean', 'variance', 'std', 'min', 'max', 'rms']
+BACKGROUND = (25, 35, 45)
+
+_application = None  # the QApplication main creates, kept referenced so Qt doesn't destroy it
+
+
+def statistics_rows(names, statistics):
+    # one table row of formatted values per signal
+    return [[name] + [f"{statistics[key][row]:.6g}" for key in STATISTICS] for row, name in enumerate(names)]
+
+
+def paint_report(painter, title, images, rows):
+    # one page: the title, the plot images stacked and the statistics table, in PAGE_WIDTH x PAGE_HEIGHT units
+    painter.setWindow(0, 0, PAGE_WIDTH, PAGE_HEIGHT)
+    font = QFont('Helvetica')
+    font.setPixelSize(32)
+    font.setBold(True)
+    painter.setFont(font)
+    painter.drawText(QRectF(MARGIN, MARGIN / 2, PLOT_WIDTH, 50), Qt.AlignCenter, title)
+
+    y = MARGIN / 2 + 70
+    for image in images:
+        painter.drawImage(QRectF(MARGIN, y, PLOT_WIDTH, PLOT_WIDTH * image.height() / image.width()), image)
+        y += PLOT_WIDTH * image.height() / image.width() + 20
+
+    font.setPixelSize(18)
+    columns = ['signal'] + STATISTICS
+    column_width = PLOT_WIDTH / len(columns)
+    for index, row in enumerate([columns] + rows):
+        font.setBold(index == 0)
+        painter.setFont(font)
+        painter.fillRect(QRectF(MARGIN, y, PLOT_WIDTH, 36), QColor(200, 200, 200) if index == 0 else Qt.white)
+        for column, text in enumerate(row):
+            cell = QRectF(MARGIN + column * column_width, y, column_width, 36)
+            painter.drawRect(cell)
+            painter.drawText(cell, Qt.AlignCenter, text)
+        y += 36
+
+
+def write_report(filename, title, images, rows):
+    # PDF for a .pdf file name, otherwise an image in the format of the suffix
+    filename = str(filename)
+    if filename.lower().endswith('.pdf'):
+        device = QPdfWriter(filename)
+        device.setPageSize(QPageSize(QPageSize.A4))
+        device.setPageMargins(QMarginsF(0, 0, 0, 0))
+        device.setResolution(RESOLUTION)
+    else:
+        device = QImage(PAGE_WIDTH, PAGE_HEIGHT, QImage.Format_RGB32)
+        device.fill(Qt.white)
+    painter = QPainter(device)
+    try:
+        paint_report(painter, title, images, rows)
+    finally:
+        painter.end()
+    if isinstance(device, QImage) and not device.save(filename):
+        raise OSError(f"can't write {filename}")
+    return filename
+
+
+def render_plot(widget):
+    # offscreen image of a plot widget, at the widget size
+    return pg.exporters.ImageExporter(widget.getPlotItem()).export(toBytes=True)
+
+
+class ReportRenderer(object):
+    # The plot widgets are created once (never shown) and their curves updated for every report
+    def __init__(self, width=PLOT_WIDTH, height=PLOT_HEIGHT):
+        self.widgets = []
+        for title, bottom, left in (('Signal', 'Time (sec)', 'Amplitude'),
+                                    ('Magnitude Response', 'Frequency (rad/sample)', 'Magnitude'),
+                                    ('Phase Response', 'Frequency (rad/sample)', 'Phase (rad, z^-1)')):
+            widget = pg.PlotWidget(title=title)
+            widget.setBackground(BACKGROUND)
+            widget.setLabel('bottom', text=bottom)
+            widget.setLabel('left', text=left)
+            widget.showGrid(x=True, y=True)
+            # laid out at the report size but never displayed
+            widget.setAttribute(Qt.WA_DontShowOnScreen)
+            widget.resize(width, height)
+            widget.show()
+            self.widgets.append(widget)
+        signal_widget, magnitude_widget, phase_widget = self.widgets
+        signal_widget.addLegend()
+        self.signal_curve = signal_widget.plot(pen=(200, 200, 200), name='original')
+        self.filtered_curve = signal_widget.plot(pen='r', name='filtered')
+        self.magnitude_curve = magnitude_widget.plot(pen='y')
+        self.phase_curve = phase_widget.plot(pen='c')
+        self.width = width
+
+    def set_response(self, frequencies, magnitude, phase):
+        self.magnitude_curve.setData(frequencies, magnitude)
+        self.phase_curve.setData(frequencies, phase)
+
+    def clear_signals(self):
+        self.pyramids = (sv.MinMaxPyramid(), sv.MinMaxPyramid())
+        self.start = None  # time and sample rate of the first block
+        self.sample_rate = DEFAULT_SAMPLE_RATE
+
+    def add_signals(self, signal_time, values, filtered):
+        # the signals block by block, only their min/max pyramids are kept
+        if self.start is None and len(signal_time) > 0:
+            self.start = signal_time[0]
+            self.sample_rate = estimate_sample_rate(signal_time, DEFAULT_SAMPLE_RATE)
+        for pyramid, samples in zip(self.pyramids, (values, filtered)):
+            pyramid.extend(samples)
+
+    def show_signals(self):
+        # min/max envelopes of about one bin per pixel, so a long recording costs as much as a short one
+        start = self.start if self.start is not None else 0
+        for curve, pyramid in zip((self.signal_curve, self.filtered_curve), self.pyramids):
+            x, y = pyramid.envelope(0, len(pyramid), self.width)
+            curve.setData(start + x / self.sample_rate, y)
+        self.widgets[0].enableAutoRange()
+
+    def render(self):
+        return [render_plot(widget) for widget in self.widgets]
+
+
+def default_output(input_file, output_dir=None, format='pdf'):
+    input_file = Path(input_file)
+    output_dir = Path(output_dir) if output_dir is not None else input_file.parent
+    return output_dir / f"{input_file.stem}_report.{format}"
+
+
+def report_file(online_filter, renderer, input_file, output_file):
+    # filter one file block by block and write its report, the renderer already shows the response of the filter
+    start = time.perf_counter()
+    online_filter.clear_state()
+    renderer.clear_signals()
+    statistics = StatisticsAccumulator(2)
+    for signal_time, values in iter_signal_chunks(input_file):
+        filtered = online_filter.process_block(values, store_output=False)
+        statistics.update(np.vstack((values, filtered)))
+        renderer.add_signals(signal_time, values, filtered)
+    renderer.show_signals()
+    write_report(output_file, Path(input_file).name, renderer.render(),
+                 statistics_rows(['original', 'filtered'], statistics.statistics()))
+    return {'input': str(input_file), 'output': str(output_file), 'samples': statistics.samples,
+            'seconds': time.perf_counter() - start}
+
+
+def report_files(design, jobs, backend='direct'):
+    # jobs: (input, output) pairs
+    online_filter = create_filter(design, backend)
+    renderer = ReportRenderer()
+    response = FrequencyResponse()
+    response.set_roots(online_filter.zeros, online_filter.poles)
+    renderer.set_response(response.frequencies, response.magnitude, response.phase)
+    return [report_file(online_filter, renderer, input_file, output_file) for input_file, output_file in jobs]
+
+
+def main(argv=None):
+    global _application
+    parser = argparse.ArgumentParser(prog='python -m report',
+                                     description='Write PDF/PNG reports of CSV signal files filtered by a design')
+    parser.add_argument('design', help='design JSON file, see FilterDesign')
+    parser.add_argument('inputs', nargs='+', metavar='input',
+                        help='CSV files (header row, time column, value column) or directories of them')
+    parser.add_argument('--output-dir', help='directory for the reports (default: next to each input)')
+    parser.add_argument('--format', choices=['pdf', 'png'], default='pdf')
+    parser.add_argument('--backend', choices=OnlineFilter.BACKENDS, default='direct',
+                        help='direct form or second order sections filtering')
+    args = parser.parse_args(argv)
+
+    try:
+        design = FilterDesign.load(args.design)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        parser.error(f"can't load the design {args.design}: {error}")
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        parser.error('no CSV files to report')
+    if args.output_dir is not None:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    # never open a window, the plots are only rendered to images
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _application = QApplication.instance() or QApplication(sys.argv[:1])
+    jobs = [(input_file, default_output(input_file, args.output_dir, args.format)) for input_file in inputs]
+    start = time.perf_counter()
+    for result in report_files(design, jobs, args.backend):
+        print(f"{result['input']} -> {result['output']} ({result['samples']} samples, {result['seconds']:.3f} s)")
+    print(f"{len(jobs)} reports in {time.perf_counter() - start:.3f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
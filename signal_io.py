@@ -0,0 +1,166 @@
+# Signal file loading. CSV files are parsed once and cached as a binary .npy sidecar next to them
+# (signal.csv -> signal.csv.npy), later loads memory-map the sidecar instead of parsing the text again. The size
+# and modification time of the CSV the sidecar was built from are kept in signal.csv.npy.stamp.
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_ROWS = 1 << 20  # rows parsed at a time, bounds the memory used while converting large files
+DEFAULT_SAMPLE_RATE = 20  # samples per second of a file without a usable time column
+
+
+def sidecar_path(filename):
+    return Path(f"{filename}.npy")
+
+
+def stamp_path(filename):
+    return Path(f"{filename}.npy.stamp")
+
+
+def csv_stamp(filename):
+    # identifies a version of the CSV, an older file copied over it (cp -p, rsync -a) has another mtime
+    stat = Path(filename).stat()
+    return f"{stat.st_size} {stat.st_mtime_ns}"
+
+
+def has_sidecar(filename):
+    # the sidecar is only trusted when it was built from the CSV as it is now, same size and mtime
+    try:
+        return sidecar_path(filename).exists() and stamp_path(filename).read_text() == csv_stamp(filename)
+    except OSError:
+        return False
+
+
+def iter_csv_chunks(filename, chunk_rows=CHUNK_ROWS):
+    # parse the CSV (header row skipped, like pd.read_csv) as float blocks of at most chunk_rows rows
+    import pandas as pd  # slow to import, only needed until the sidecar exists
+    with pd.read_csv(filename, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk.to_numpy(dtype=np.float64)
+
+
+def write_sidecar(filename, chunk_rows=CHUNK_ROWS):
+    # The row count is only known at the end of the parse, so the rows are streamed to a raw file
+    # first and the .npy header is written in front of them once the shape is known
+    sidecar = sidecar_path(filename)
+    raw_file = sidecar.with_name(sidecar.name + '.raw')
+    tmp_file = sidecar.with_name(sidecar.name + '.tmp')
+    rows, columns = 0, 0
+    # taken before parsing, a CSV changed meanwhile won't match it
+    stamp = csv_stamp(filename)
+    try:
+        with open(raw_file, 'wb') as raw:
+            for chunk in iter_csv_chunks(filename, chunk_rows):
+                chunk.tofile(raw)
+                rows += chunk.shape[0]
+                columns = chunk.shape[1]
+        with open(tmp_file, 'wb') as out, open(raw_file, 'rb') as raw:
+            np.lib.format.write_array_header_1_0(
+                out, {'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)), 'fortran_order': False,
+                      'shape': (rows, columns)})
+            shutil.copyfileobj(raw, out, 16 << 20)
+        stamp_path(filename).unlink(missing_ok=True)
+        os.replace(tmp_file, sidecar)
+        stamp_path(filename).write_text(stamp)
+    finally:
+        for leftover in (raw_file, tmp_file):
+            if leftover.exists():
+                leftover.unlink()
+    return sidecar
+
+
+def load_csv(filename, use_sidecar=True):
+    # 2D float array of the CSV rows, memory-mapped read only from the sidecar when possible
+    if use_sidecar:
+        if not has_sidecar(filename):
+            try:
+                write_sidecar(filename)
+            except OSError:
+                # e.g. a read only directory, parse the CSV into memory instead
+                return np.concatenate(list(iter_csv_chunks(filename)))
+        return np.load(sidecar_path(filename), mmap_mode='r')
+    return np.concatenate(list(iter_csv_chunks(filename)))
+
+
+def estimate_sample_rate(time, default=None):
+    # samples per second from the time column, the median step ignores the odd irregular timestamp
+    steps = np.diff(np.asarray(time[:10001], dtype=float))
+    steps = steps[np.isfinite(steps) & (steps > 0)]
+    if len(steps) == 0:
+        return default
+    return 1 / float(np.median(steps))
+
+
+def signal_statistics(signals):
+    # statistics of one signal or of equally long signals stacked as rows, every row in the same vectorized pass
+    signals = np.atleast_2d(np.asarray(signals, dtype=float))
+    rows, samples = signals.shape
+    if samples == 0:
+        nan = np.full(rows, np.nan)
+        return {'samples': np.zeros(rows, dtype=int), 'mean': nan, 'variance': nan, 'std': nan, 'min': nan,
+                'max': nan, 'rms': nan}
+    mean = signals.mean(axis=1)
+    variance = signals.var(axis=1)
+    return {'samples': np.full(rows, samples), 'mean': mean, 'variance': variance, 'std': np.sqrt(variance),
+            'min': signals.min(axis=1), 'max': signals.max(axis=1), 'rms': np.sqrt(variance + mean ** 2)}
+
+
+class StatisticsAccumulator(object):
+    # signal_statistics of rows of signals given block by block, the blocks merged with Chan's update of the
+    # mean and the sum of squared deviations so no block but the current one is kept
+    def __init__(self, rows=1):
+        self.samples = 0
+        self.mean = np.zeros(rows)
+        self._deviations = np.zeros(rows)  # sum of the squared deviations from the mean
+        self.min = np.full(rows, np.inf)
+        self.max = np.full(rows, -np.inf)
+
+    def update(self, signals):
+        signals = np.atleast_2d(np.asarray(signals, dtype=float))
+        count = signals.shape[1]
+        if count == 0:
+            return
+        mean = signals.mean(axis=1)
+        deviations = ((signals - mean[:, None]) ** 2).sum(axis=1)
+        total = self.samples + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self._deviations += deviations + delta ** 2 * self.samples * count / total
+        self.min = np.minimum(self.min, signals.min(axis=1))
+        self.max = np.maximum(self.max, signals.max(axis=1))
+        self.samples = total
+
+    def statistics(self):
+        rows = len(self.mean)
+        if self.samples == 0:
+            return signal_statistics(np.empty((rows, 0)))
+        variance = self._deviations / self.samples
+        return {'samples': np.full(rows, self.samples), 'mean': self.mean.copy(), 'variance': variance,
+                'std': np.sqrt(variance), 'min': self.min.copy(), 'max': self.max.copy(),
+                'rms': np.sqrt(variance + self.mean ** 2)}
+
+
+def load_signal(filename, use_sidecar=True):
+    # time and value columns of a signal file (the layout MainApp.open_signal reads)
+    data = load_csv(filename, use_sidecar)
+    return data[:, 0], data[:, 1]
+
+
+def iter_signal_chunks(filename, chunk_rows=CHUNK_ROWS, use_sidecar=True):
+    # (time, values) blocks of at most chunk_rows rows, for files larger than memory: read from the memory-mapped
+    # sidecar (written first when missing, which also streams), or straight from the CSV when it can't be written
+    if use_sidecar and not has_sidecar(filename):
+        try:
+            write_sidecar(filename, chunk_rows)
+        except OSError:
+            use_sidecar = False
+    if use_sidecar:
+        data = np.load(sidecar_path(filename), mmap_mode='r')
+        for start in range(0, len(data), chunk_rows):
+            chunk = data[start:start + chunk_rows]
+            yield chunk[:, 0], chunk[:, 1]
+    else:
+        for chunk in iter_csv_chunks(filename, chunk_rows):
+            yield chunk[:, 0], chunk[:, 1]
@@ -0,0 +1,137 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from all_pass_filter import CONJUGATE_TOLERANCE, HistoryBuffer, OnlineFilter, conjugate_paired
+from filter_design import FilterDesign
+
+
+@pytest.mark.parametrize('roots, paired', [
+    ([], True),
+    ([0.5 + 0.5j, 0.5 - 0.5j], True),
+    ([0.5 - 0.5j, -0.2 + 0.9j, 0.5 + 0.5j, -0.2 - 0.9j], True),
+    ([0.5 + 0.5j, 0.5 - 0.5j, 0.5 + 0.5j, 0.5 - 0.5j], True),
+    ([0.5 + 0.5j, 0.5 + 0.5j, 0.5 - 0.5j], False),
+    ([0.7], True),
+    ([0.7, -0.3, 0.0], True),
+    ([0.7 + 0.1 * CONJUGATE_TOLERANCE * 1j], True),
+    ([0.5 + 0.5j], False),
+    ([0.5 + 0.5j, 0.7], False),
+    ([0.5 + 0.5j, 0.5 + 0.5j], False),
+    ([0.5 + 0.5j, 0.5 - (0.5 + 0.1 * CONJUGATE_TOLERANCE) * 1j], True),
+    ([0.5 + 0.5j, 0.5 + 0.1 * CONJUGATE_TOLERANCE - 0.5j], True),
+    ([0.5 + 0.5j, 0.5 - (0.5 + 10 * CONJUGATE_TOLERANCE) * 1j], False),
+    ([0.5 + 0.5j, 0.5 + 10 * CONJUGATE_TOLERANCE - 0.5j], False),
+])
+def test_conjugate_paired(roots, paired):
+    assert conjugate_paired(roots) == paired
+
+
+def test_tolerance_scales_with_the_roots():
+    assert conjugate_paired([100 + 100j, 100 - (100 + 10 * CONJUGATE_TOLERANCE) * 1j])
+    assert not conjugate_paired([100 + 100j, 100 - (100 + 1000 * CONJUGATE_TOLERANCE) * 1j])
+
+
+@pytest.mark.parametrize('design, is_real', [
+    (FilterDesign(zeros=[(0.5, 0.5)], zerosf=[(0.5, -0.5)], poles=[(0.3, 0.6)], polesf=[(0.3, -0.6)]), True),
+    (FilterDesign(zeros=[(0.5, 0.5)], zerosf=[(0.5, -0.5 - 1e-12)]), True),
+    (FilterDesign(zeros=[(0.7, 0.0)], poles=[(-0.4, 0.0)]), True),
+    (FilterDesign(zeros=[(0.5, 0.5)]), False),
+    (FilterDesign(poles=[(0.5, 0.5)], polesf=[(0.5, -0.5 - 1e-6)]), False),
+])
+def test_is_real(design, is_real):
+    online_filter = OnlineFilter([], design)
+    assert online_filter.is_real == is_real
+    numerator, denominator = online_filter.H_numerator_poly, online_filter.H_denominator_poly
+    if is_real:
+        assert numerator.dtype == float and denominator.dtype == float
+    else:
+        # a lone complex root keeps its complex coefficients
+        assert np.iscomplexobj(numerator) or np.iscomplexobj(denominator)
+
+
+class DequeHistory(object):
+    # the reference model of HistoryBuffer: newest first, zero initialized
+    def __init__(self, size):
+        self.values = deque([0.0] * size, maxlen=size)
+
+    def push(self, value):
+        if self.values.maxlen > 0:
+            self.values.appendleft(value)
+
+    def extend(self, values):
+        for value in values:
+            self.push(value)
+
+    def resize(self, size):
+        values = list(self.values)[:size]
+        self.values = deque(values + [0.0] * (size - len(values)), maxlen=size)
+
+
+def assert_same_history(history, expected):
+    assert len(history) == len(expected.values)
+    np.testing.assert_array_equal(history.values, list(expected.values))
+
+
+def test_history_push_wraps_around():
+    history, expected = HistoryBuffer(4), DequeHistory(4)
+    assert_same_history(history, expected)
+    for value in range(1, 12):
+        history.push(value)
+        expected.push(value)
+        assert_same_history(history, expected)
+
+
+@pytest.mark.parametrize('count', [0, 1, 3, 5, 6, 13])
+def test_history_extend(count):
+    # blocks shorter, as long as and longer than the history, after the start has wrapped around
+    history, expected = HistoryBuffer(5), DequeHistory(5)
+    for value in (1.0, 2.0, 3.0):
+        history.push(value)
+        expected.push(value)
+    values = np.arange(count) + 10.0
+    history.extend(values)
+    expected.extend(values)
+    assert_same_history(history, expected)
+    history.push(-1.0)
+    expected.push(-1.0)
+    assert_same_history(history, expected)
+
+
+def test_history_resize_keeps_the_newest_values():
+    history, expected = HistoryBuffer(3), DequeHistory(3)
+    for size in (5, 2, 2, 0, 4, 1, 6):
+        for value in np.arange(4) + 10.0 * size:
+            history.push(value)
+            expected.push(value)
+        history.resize(size)
+        expected.resize(size)
+        assert_same_history(history, expected)
+        history.extend([1.0, 2.0])
+        expected.extend([1.0, 2.0])
+        assert_same_history(history, expected)
+
+
+def test_history_random_operations():
+    rng = np.random.default_rng(0)
+    history, expected = HistoryBuffer(7), DequeHistory(7)
+    for _ in range(500):
+        operation = rng.integers(4)
+        if operation == 0:
+            value = rng.normal()
+            history.push(value)
+            expected.push(value)
+        elif operation == 1:
+            values = rng.normal(size=rng.integers(0, 20))
+            history.extend(values)
+            expected.extend(values)
+        elif operation == 2:
+            size = int(rng.integers(0, 10))
+            history.resize(size)
+            expected.resize(size)
+        else:
+            history.clear()
+            expected.resize(0)
+            expected.resize(len(history))
+        assert_same_history(history, expected)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from all_pass_filter import all_pass_cascade_group_delay
+from all_pass_optimizer import add_stage, coefficients_from_parameters, optimize_all_pass
+from frequency_response import FrequencyResponse, design_group_delay
+
+ZEROS = [0.9j, -0.9j, -1]
+POLES = [0.7 + 0.5j, 0.7 - 0.5j]
+
+
+def optimize(stages):
+    return optimize_all_pass(ZEROS, POLES, stages, restarts=2, population=64, iterations=40)
+
+
+def test_more_stages_never_worse():
+    variations = [optimize(stages)['variation'] for stages in range(1, 5)]
+    assert all(later <= earlier for earlier, later in zip(variations, variations[1:]))
+    assert variations[-1] < optimize(1)['initial_variation']
+
+
+def test_result_is_a_stable_real_cascade():
+    result = optimize(3)
+    coefficients = np.array(result['coefficients'], dtype=complex)
+    assert 0 < len(coefficients) <= 3
+    assert np.all(np.abs(coefficients) < 1)
+    np.testing.assert_allclose(np.sort_complex(coefficients), np.sort_complex(coefficients.conj()))
+    # the reported variation is the one of the returned stages
+    frequencies = FrequencyResponse().frequencies
+    low, high = result['passband']
+    frequencies = frequencies[(frequencies >= low) & (frequencies <= high)]
+    delay = design_group_delay(ZEROS, POLES, frequencies) + all_pass_cascade_group_delay(coefficients, frequencies)
+    assert np.isclose(np.std(delay), result['variation'])
+
+
+def test_pairs_cover_real_stages():
+    # a pair can be two real stages, and adding a stage keeps the coefficients plus a pure delay
+    np.testing.assert_allclose(coefficients_from_parameters(np.array([0.3, -0.2])), [0.5, 0.1])
+    np.testing.assert_allclose(coefficients_from_parameters(np.array([0.3, 0.2])), [0.3 + 0.2j, 0.3 - 0.2j])
+    parameters = np.array([0.3, 0.2, 0.6])
+    np.testing.assert_allclose(np.sort_complex(coefficients_from_parameters(add_stage(parameters))),
+                               np.sort_complex(np.append(coefficients_from_parameters(parameters), 0)))
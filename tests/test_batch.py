@@ -0,0 +1,62 @@
+import functools
+
+import numpy as np
+import pytest
+
+import batch
+from filter_design import FilterDesign
+from signal_io import iter_signal_chunks
+
+
+def write_csv(path, values):
+    np.savetxt(path, np.column_stack((np.arange(len(values)) / 20, values)), delimiter=',', header='time,value',
+               comments='')
+
+
+def design():
+    return FilterDesign(zeros=[(0.5, 0.5)], poles=[(0.3, -0.6)], zerosf=[(0.5, -0.5)], polesf=[(0.3, 0.6)],
+                        all_pass=[0.4])
+
+
+def test_streamed_file_matches_the_whole_signal(tmp_path, monkeypatch):
+    values = np.random.default_rng(0).normal(size=1003)
+    input_file, output_file = tmp_path / 'signal.csv', tmp_path / 'signal_filtered.csv'
+    write_csv(input_file, values)
+    monkeypatch.setattr(batch, 'iter_signal_chunks', functools.partial(iter_signal_chunks, chunk_rows=100))
+    for backend in ('direct', 'sos'):
+        online_filter = batch.create_filter(design(), backend)
+        result = batch.run_file(online_filter, input_file, output_file)
+        assert result['samples'] == len(values)
+        written = np.loadtxt(output_file, delimiter=',', skiprows=1)
+        np.testing.assert_allclose(written[:, 0], np.arange(len(values)) / 20)
+        np.testing.assert_allclose(written[:, 1], batch.filter_signal(design(), values, backend), rtol=1e-8,
+                                   atol=1e-10)
+
+
+def test_inputs_are_collected_once(tmp_path, monkeypatch):
+    write_csv(tmp_path / 'a.csv', [1.0, 2.0])
+    write_csv(tmp_path / 'b.csv', [1.0, 2.0])
+    write_csv(tmp_path / 'b_filtered.csv', [1.0, 2.0])
+    monkeypatch.chdir(tmp_path)
+    inputs = batch.collect_inputs([tmp_path, 'a.csv', tmp_path / '..' / tmp_path.name / 'b.csv', 'a.csv'])
+    assert [path.name for path in inputs] == ['a.csv', 'b.csv']
+
+
+@pytest.mark.parametrize('design_json, field', [
+    ('{"zeros": [[0.5, 0.5, 1]]}', 'zeros'),
+    ('{"polesf": 5}', 'polesf'),
+    ('{"poles": [[0.5, null]]}', 'poles'),
+    ('{"all_pass": ["half"]}', 'all_pass'),
+    ('{"all_pass": [[0.3]]}', 'all_pass'),
+    ('[[0.5, 0.5]]', 'JSON object'),
+    ('{"gain": 2}', 'gain'),
+])
+def test_malformed_design_is_a_usage_error(tmp_path, capsys, design_json, field):
+    design_file, input_file = tmp_path / 'design.json', tmp_path / 'signal.csv'
+    design_file.write_text(design_json)
+    write_csv(input_file, [1.0, 2.0])
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main([str(design_file), str(input_file)])
+    assert exit_info.value.code == 2
+    error = capsys.readouterr().err.strip().splitlines()[-1]
+    assert error.startswith('python -m batch: error: ') and field in error
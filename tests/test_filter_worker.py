@@ -0,0 +1,61 @@
+import threading
+import time
+
+import numpy as np
+
+from filter_worker import FilterWorker
+
+
+class GainFilter(object):
+    # stands in for an OnlineFilter, optionally blocks until released
+    def __init__(self, gain=2.0):
+        self.gain = gain
+        self.release = threading.Event()
+        self.release.set()
+
+    def process_block(self, block, store_output=True):
+        self.release.wait()
+        return self.gain * block
+
+    def clear_state(self):
+        pass
+
+
+def test_worker_that_keeps_up_has_no_late_samples():
+    worker = FilterWorker(GainFilter())
+    try:
+        filtered = []
+        # submit then take in the same frame, like MainApp.draw_signal
+        for frame in range(30):
+            worker.submit(np.full(40, float(frame)))
+            filtered.append(worker.take())
+            time.sleep(0.02)
+        deadline = time.time() + 5
+        while worker.pending and time.time() < deadline:
+            filtered.append(worker.take())
+            time.sleep(0.01)
+        assert worker.late_samples == 0
+        assert worker.dropped_samples == 0
+        np.testing.assert_array_equal(np.concatenate(filtered), 2.0 * np.repeat(np.arange(30.0), 40))
+    finally:
+        worker.stop()
+
+
+def test_stalled_worker_counts_each_late_sample_once():
+    online_filter = GainFilter()
+    online_filter.release.clear()
+    worker = FilterWorker(online_filter)
+    try:
+        worker.submit(np.ones(100))
+        worker.take()  # not due yet
+        assert worker.late_samples == 0
+        for _ in range(5):
+            worker.take()
+        assert worker.late_samples == 100
+        worker.submit(np.ones(20))
+        for _ in range(5):
+            worker.take()
+        assert worker.late_samples == 120
+    finally:
+        online_filter.release.set()
+        worker.stop()
@@ -0,0 +1,60 @@
+import numpy as np
+from scipy.signal import freqz, group_delay
+
+from frequency_response import FrequencyResponse, design_group_delay
+
+
+def scipy_group_delay(zeros, poles, frequencies):
+    # the polynomials in z^-1 the OnlineFilter builds
+    numerator = np.poly(zeros) if len(zeros) else np.array([1.0])
+    denominator = np.poly(poles) if len(poles) else np.array([1.0])
+    return group_delay((numerator, denominator), frequencies)[1]
+
+
+def test_group_delay_matches_scipy():
+    rng = np.random.default_rng(0)
+    zeros = list(rng.uniform(-1, 1, 3) + 1j * rng.uniform(-1, 1, 3))
+    zeros += [np.conj(z) for z in zeros] + [-1.0]
+    poles = list(0.9 * (rng.uniform(-1, 1, 2) + 1j * rng.uniform(-1, 1, 2)))
+    poles += [np.conj(p) for p in poles]
+    response = FrequencyResponse()
+    response.set_roots(zeros, poles)
+    expected = scipy_group_delay(zeros, poles, response.frequencies)
+    np.testing.assert_allclose(design_group_delay(zeros, poles, response.frequencies), expected, atol=1e-9)
+    np.testing.assert_allclose(response.group_delay, expected, atol=1e-9)
+
+
+def test_fir_group_delay_at_dc():
+    zeros = [0.5 + 0.5j, 0.5 - 0.5j]
+    delay = design_group_delay(zeros, [], [0.0, 0.5])
+    np.testing.assert_allclose(delay, scipy_group_delay(zeros, [], [0.0, 0.5]), atol=1e-12)
+    assert abs(delay[0]) < 1e-12
+
+
+def test_incremental_moves_match_scipy():
+    rng = np.random.default_rng(1)
+    zeros = list(rng.uniform(-1, 1, 4) + 1j * rng.uniform(-1, 1, 4))
+    poles = list(0.8 * (rng.uniform(-1, 1, 3) + 1j * rng.uniform(-1, 1, 3)))
+    response = FrequencyResponse()
+    response.set_roots(zeros, poles)
+    for step in range(200):
+        zeros[step % 4] += 0.01 * (rng.normal() + 1j * rng.normal())
+        poles[step % 3] *= 0.999
+        response.set_roots(zeros, poles)
+    expected = scipy_group_delay(zeros, poles, response.frequencies)
+    np.testing.assert_allclose(response.group_delay, expected, atol=1e-8)
+
+
+def test_phase_matches_the_group_delay():
+    # both in powers of z^-1, also with more zeros than poles and the other way around
+    rng = np.random.default_rng(3)
+    for zero_count, pole_count in ((4, 2), (1, 3), (3, 3)):
+        zeros = 0.9 * rng.uniform(-1, 1, zero_count) + 0.5j * rng.uniform(-1, 1, zero_count)
+        poles = 0.9 * rng.uniform(-1, 1, pole_count) + 0.5j * rng.uniform(-1, 1, pole_count)
+        response = FrequencyResponse(4096)
+        response.set_roots(zeros, poles)
+        _, expected = freqz(np.poly(zeros), np.poly(poles), worN=4096)
+        np.testing.assert_allclose(np.exp(1j * response.phase), np.exp(1j * np.angle(expected)), atol=1e-9)
+        phase = np.unwrap(response.phase)
+        slope = -np.gradient(phase, response.frequencies)
+        np.testing.assert_allclose(slope[1:-1], response.group_delay[1:-1], atol=0.05)
@@ -0,0 +1,30 @@
+import threading
+import time
+
+from instrumentation import Instrumentation
+
+
+def test_stage_timed_from_two_threads():
+    probe = Instrumentation()
+    probe.enabled = True
+    measurements = 20
+    barrier = threading.Barrier(2)
+
+    def work(delay):
+        barrier.wait()
+        for _ in range(measurements):
+            with probe.stage('filter.block'):
+                time.sleep(delay)
+
+    threads = [threading.Thread(target=work, args=(delay,)) for delay in (0.005, 0.013)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = probe.stages['filter.block']
+    assert stats.count == 2 * measurements
+    # each measurement keeps its own start: nothing shorter than its sleep, the total is the sum of the sleeps
+    assert stats.histogram[0] == 0
+    assert stats.total >= measurements * (0.005 + 0.013)
+    assert stats.max < 0.5
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from scipy.signal import lfilter, sosfilt, tf2sos, zpk2sos
+
+from all_pass_filter import AllPassFilter, OnlineFilter, zeros_poles_to_sos
+from filter_design import FilterDesign
+
+BACKENDS = OnlineFilter.BACKENDS
+
+
+def paired_design():
+    return FilterDesign(zeros=[(0.5, 0.5), (-0.9, 0.0)], poles=[(0.3, -0.6), (0.7, 0.0)],
+                        zerosf=[(0.5, -0.5)], polesf=[(0.3, 0.6)])
+
+
+def create_filter(signal, backend, all_pass=(0.4,), design=None):
+    design = design if design is not None else paired_design()
+    return OnlineFilter(list(signal), design, [AllPassFilter(a) for a in all_pass], backend=backend)
+
+
+def signal(length=200, seed=0):
+    return np.random.default_rng(seed).normal(size=length)
+
+
+def reference(online_filter, samples):
+    return lfilter(np.real(online_filter.H_numerator_poly), np.real(online_filter.H_denominator_poly), samples)
+
+
+def apply_samples(online_filter, count):
+    start = len(online_filter.filtered_signal)
+    for _ in range(count):
+        online_filter.apply_filter()
+    return np.array(online_filter.filtered_signal[start:])
+
+
+def process_samples(online_filter, samples):
+    # like the playback does, a block moves the position along the signal too
+    filtered = online_filter.process_block(samples)
+    online_filter.current_sample_index += len(samples)
+    return filtered
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_sample_at_a_time_matches_lfilter(backend):
+    samples = signal()
+    online_filter = create_filter(samples, backend)
+    np.testing.assert_allclose(apply_samples(online_filter, len(samples)), reference(online_filter, samples),
+                               rtol=1e-9, atol=1e-12)
+    assert online_filter.is_consumed
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_uneven_blocks_match_sample_at_a_time(backend):
+    samples = signal()
+    expected = apply_samples(create_filter(samples, backend), len(samples))
+    online_filter = create_filter(samples, backend)
+    bounds = [0, 1, 2, 9, 10, 57, 58, 131, 200]
+    filtered = np.concatenate([process_samples(online_filter, samples[start:end])
+                               for start, end in zip(bounds[:-1], bounds[1:])])
+    np.testing.assert_allclose(filtered, expected, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(online_filter.filtered_signal, expected, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_blocks_and_samples_mixed(backend):
+    samples = signal()
+    expected = apply_samples(create_filter(samples, backend), len(samples))
+    online_filter = create_filter(samples, backend)
+    pieces = [('sample', 3), ('block', 17), ('sample', 1), ('block', 1), ('block', 40), ('sample', 25),
+              ('block', 100), ('sample', 13)]
+    filtered = []
+    position = 0
+    for kind, count in pieces:
+        if kind == 'sample':
+            filtered.append(apply_samples(online_filter, count))
+        else:
+            filtered.append(process_samples(online_filter, samples[position:position + count]))
+        position += count
+    assert position == len(samples)
+    np.testing.assert_allclose(np.concatenate(filtered), expected, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_clear_state_starts_over(backend):
+    samples = signal()
+    expected = apply_samples(create_filter(samples, backend), len(samples))
+    online_filter = create_filter(samples, backend)
+    process_samples(online_filter, samples[:50])
+    apply_samples(online_filter, 7)
+    online_filter.clear_state()
+    assert online_filter.filtered_signal == []
+    filtered = np.concatenate((apply_samples(online_filter, 5), process_samples(online_filter, samples[5:120]),
+                               apply_samples(online_filter, 80)))
+    np.testing.assert_allclose(filtered, expected, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_unpaired_complex_design_blocks_match_samples(backend):
+    # a complex all-pass stage has no conjugate, both paths filter over the real parts of the coefficients
+    samples = signal()
+    online_filter = create_filter(samples, backend, all_pass=(0.3 + 0.4j, -0.5))
+    assert not online_filter.is_real
+    expected = apply_samples(online_filter, len(samples))
+    np.testing.assert_allclose(expected, reference(online_filter, samples), rtol=1e-9, atol=1e-12)
+    online_filter.clear_state()
+    filtered = np.concatenate((process_samples(online_filter, samples[:33]), apply_samples(online_filter, 11),
+                               process_samples(online_filter, samples[44:])))
+    np.testing.assert_allclose(filtered, expected, rtol=1e-9, atol=1e-12)
+
+
+DESIGNS = {
+    'paired': (paired_design(), (0.4,)),
+    'paired all-pass': (paired_design(), (0.3 + 0.4j, 0.3 - 0.4j, -0.5)),
+    'unpaired all-pass': (paired_design(), (0.3 + 0.4j, -0.5)),
+    'all-pass only': (FilterDesign(), (0.6, -0.2)),
+    'high order': (FilterDesign(zeros=[(np.cos(w), np.sin(w)) for w in (0.5, 1.0, 2.0)],
+                                zerosf=[(np.cos(w), -np.sin(w)) for w in (0.5, 1.0, 2.0)],
+                                poles=[(0.9 * np.cos(w), 0.9 * np.sin(w)) for w in (0.4, 0.8, 1.6)],
+                                polesf=[(0.9 * np.cos(w), -0.9 * np.sin(w)) for w in (0.4, 0.8, 1.6)]), ()),
+}
+
+
+@pytest.mark.parametrize('name', DESIGNS)
+def test_sos_matches_direct(name):
+    design, all_pass = DESIGNS[name]
+    samples = signal(500)
+    direct = create_filter(samples, 'direct', all_pass, design).process_block(samples)
+    sos = create_filter(samples, 'sos', all_pass, design).process_block(samples)
+    np.testing.assert_allclose(sos, direct, rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize('name', DESIGNS)
+def test_sos_step_matches_sosfilt(name):
+    # the per sample transposed direct form II step against sosfilt over the whole signal
+    design, all_pass = DESIGNS[name]
+    samples = signal(300)
+    online_filter = create_filter(samples, 'sos', all_pass, design)
+    expected = sosfilt(online_filter.sos, samples)
+    np.testing.assert_allclose(apply_samples(online_filter, len(samples)), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_unpaired_roots_fall_back_to_tf2sos():
+    online_filter = create_filter([], 'sos', (0.3 + 0.4j, -0.5))
+    numerator, denominator = online_filter.H_numerator_poly, online_filter.H_denominator_poly
+    with pytest.raises(ValueError):
+        zpk2sos(online_filter.zeros, online_filter.poles, 1)
+    sos = zeros_poles_to_sos(online_filter.zeros, online_filter.poles, numerator, denominator)
+    assert sos.dtype == float
+    np.testing.assert_allclose(sos, tf2sos(np.real(numerator), np.real(denominator)))
+    samples = signal()
+    np.testing.assert_allclose(sosfilt(sos, samples), reference(online_filter, samples), rtol=1e-9, atol=1e-12)
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+from signal_io import (StatisticsAccumulator, has_sidecar, iter_signal_chunks, load_csv, load_signal, sidecar_path,
+                       signal_statistics)
+
+
+def write_csv(path, values):
+    np.savetxt(path, np.column_stack((np.arange(len(values)) / 20, values)), delimiter=',', header='time,value',
+               comments='')
+
+
+def test_sidecar_reused_while_the_csv_is_unchanged(tmp_path):
+    csv_file = tmp_path / 'signal.csv'
+    write_csv(csv_file, [1.0, 2.0, 3.0])
+    _, values = load_signal(csv_file)
+    np.testing.assert_array_equal(values, [1.0, 2.0, 3.0])
+    assert sidecar_path(csv_file).exists()
+    assert has_sidecar(csv_file)
+
+
+def test_older_csv_copied_over_is_reparsed(tmp_path):
+    csv_file = tmp_path / 'signal.csv'
+    write_csv(csv_file, [1.0, 2.0, 3.0])
+    load_csv(csv_file)
+    # like cp -p / rsync -a of an older file: new content, mtime older than the sidecar
+    write_csv(csv_file, [4.0, 5.0, 6.0, 7.0])
+    os.utime(csv_file, ns=(10 ** 18, 10 ** 18))
+    assert not has_sidecar(csv_file)
+    _, values = load_signal(csv_file)
+    np.testing.assert_array_equal(values, [4.0, 5.0, 6.0, 7.0])
+    assert has_sidecar(csv_file)
+
+
+def test_sidecar_without_stamp_is_not_trusted(tmp_path):
+    csv_file = tmp_path / 'signal.csv'
+    write_csv(csv_file, [1.0, 2.0])
+    np.save(sidecar_path(csv_file), np.zeros((5, 2)))
+    assert not has_sidecar(csv_file)
+    np.testing.assert_array_equal(load_signal(csv_file)[1], [1.0, 2.0])
+
+
+def test_signal_chunks_match_the_whole_file(tmp_path):
+    csv_file = tmp_path / 'signal.csv'
+    values = np.sin(np.arange(1003) / 7)
+    write_csv(csv_file, values)
+    for use_sidecar in (False, True, True):  # parsed, then written and read from the sidecar, then reused
+        chunks = list(iter_signal_chunks(csv_file, chunk_rows=100, use_sidecar=use_sidecar))
+        assert [len(chunk_values) for _, chunk_values in chunks] == [100] * 10 + [3]
+        np.testing.assert_allclose(np.concatenate([chunk_values for _, chunk_values in chunks]), values)
+        np.testing.assert_allclose(np.concatenate([chunk_time for chunk_time, _ in chunks]),
+                                   np.arange(1003) / 20)
+
+
+def test_statistics_accumulated_by_blocks():
+    signals = np.random.default_rng(0).normal(3, 2, (2, 1001))
+    accumulator = StatisticsAccumulator(2)
+    for start in range(0, 1001, 97):
+        accumulator.update(signals[:, start:start + 97])
+    expected = signal_statistics(signals)
+    for key, value in accumulator.statistics().items():
+        np.testing.assert_allclose(value, expected[key])
+    assert np.isnan(StatisticsAccumulator(2).statistics()['mean']).all()
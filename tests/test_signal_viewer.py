@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from SignalViewer import MinMaxPyramid, PlotSignal  # noqa: E402
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_statistics_of_time_value_rows():
+    # load_dataset keeps the (time, value) rows of the CSV, the time column is no part of the signal
+    time = np.arange(1000) / 20
+    values = np.sin(time)
+    signal = PlotSignal(data=np.column_stack((time, values)))
+    assert signal.statistics['samples'][0] == 1000
+    assert signal.mean == pytest.approx(values.mean())
+    assert signal.std == pytest.approx(values.std())
+    assert signal.statistics['max'][0] == pytest.approx(values.max())
+    assert signal.statistics['rms'][0] == pytest.approx(np.sqrt(np.mean(values ** 2)))
+
+
+def test_statistics_of_plain_values():
+    signal = PlotSignal(data=[1.0, 2.0, 3.0, 4.0])
+    assert signal.mean == pytest.approx(2.5)
+    assert signal.statistics['min'][0] == 1.0
+
+
+def brute_envelope(data, first, last, size):
+    # min/max of every complete bin of size samples overlapping [first, last), then the samples after them
+    x, y = [], []
+    first_bin, last_bin = first // size, min(len(data) // size, -(-last // size))
+    for index in range(first_bin, last_bin):
+        bucket = data[index * size:(index + 1) * size]
+        x += [index * size + (size - 1) / 2] * 2
+        y += [bucket.min(), bucket.max()]
+    tail = max(last_bin * size, first)
+    x += list(range(tail, last))
+    y += list(data[tail:last])
+    return np.array(x), np.array(y)
+
+
+def check_envelope(pyramid, data, x_min, x_max, width):
+    x, y = pyramid.envelope(x_min, x_max, width)
+    first, last = max(0, int(np.floor(x_min))), min(len(data), int(np.ceil(x_max)) + 1)
+    if last <= first:
+        assert len(x) == len(y) == 0
+        return
+    # the bins of the coarsest level with about one bin per pixel, the raw samples when they fit
+    size = 1
+    if last - first > 2 * width:
+        while 2 * size <= (last - first) / width and 2 * size <= len(data):
+            size *= 2
+    if size == 1:
+        np.testing.assert_array_equal(x, np.arange(first, last))
+        np.testing.assert_array_equal(y, data[first:last])
+        assert last - first <= 4 * width
+        return
+    expected_x, expected_y = brute_envelope(data, first, last, size)
+    np.testing.assert_array_equal(x, expected_x)
+    np.testing.assert_array_equal(y, expected_y)
+    assert len(x) <= 4 * width + 2 * size
+
+
+@pytest.mark.parametrize('x_min, x_max, width', [
+    (0, 999, 100), (0, 999, 10), (0, 999, 1000), (-5.5, 2000, 64), (3.7, 517.2, 50), (1, 1, 10),
+    (129, 640, 7), (500, 400, 10), (998.5, 1200, 10), (17, 983, 1),
+])
+def test_envelope_matches_brute_force(x_min, x_max, width):
+    data = np.random.default_rng(0).normal(size=1000)
+    pyramid = MinMaxPyramid(capacity=16)
+    pyramid.extend(data)
+    check_envelope(pyramid, data, x_min, x_max, width)
+
+
+def test_envelope_while_growing():
+    # uneven appends across the capacity doublings, the coarse levels must follow every one of them
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=3000)
+    pyramid = MinMaxPyramid(capacity=4)
+    length = 0
+    for step in (1, 2, 3, 5, 8, 13, 100, 1, 1, 250, 511, 1, 1024, 79):
+        if step == 1:
+            pyramid.append(data[length])
+        else:
+            pyramid.extend(data[length:length + step])
+        length += step
+        assert len(pyramid) == length
+        for x_min, x_max, width in ((0, length, 8), (length / 3, length - 0.5, 5), (7, length + 10, 2)):
+            check_envelope(pyramid, data[:length], x_min, x_max, width)
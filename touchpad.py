@@ -0,0 +1,82 @@
+# Mouse touchpad signal generator: a cosine whose frequency follows the horizontal speed of the mouse,
+# synthesized at a fixed sample rate and kept in a bounded rolling window
+import numpy as np
+
+TOUCHPAD_SAMPLE_RATE = 200  # samples per second
+TOUCHPAD_WINDOW = 2000  # samples kept for drawing, 10 s at the default rate
+
+
+class RollingWindow(object):
+    # The latest capacity samples, oldest first, with their sample numbers. Every sample is written twice into
+    # double length arrays so the window is always a contiguous view and adding samples never allocates.
+    def __init__(self, capacity=TOUCHPAD_WINDOW):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity)
+        self._indices = np.zeros(2 * capacity)
+        self.total = 0  # samples added since the last clear
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def data(self):
+        end = self.total % self.capacity + self.capacity
+        return self._data[end - len(self):end]
+
+    @property
+    def indices(self):
+        end = self.total % self.capacity + self.capacity
+        return self._indices[end - len(self):end]
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        numbers = np.arange(self.total, self.total + len(values))
+        self.total += len(values)
+        # only the newest capacity values can stay
+        values, numbers = values[-self.capacity:], numbers[-self.capacity:]
+        positions = numbers % self.capacity
+        for offset in (0, self.capacity):
+            self._data[positions + offset] = values
+            self._indices[positions + offset] = numbers
+
+    def clear(self):
+        self.total = 0
+
+
+class TouchpadSource(object):
+    # x(n) = amplitude * cos(phase(n)), the phase advances by omega / sample_rate per sample so a change of
+    # speed changes the frequency without a jump in the signal
+    def __init__(self, sample_rate=TOUCHPAD_SAMPLE_RATE, amplitude=10):
+        self.sample_rate = sample_rate
+        self.amplitude = amplitude
+        self.omega = 0  # radians per second
+        self.phase = 0
+        self._clock = None  # time of the next sample, None while paused
+
+    def set_velocity(self, velocity):
+        # mouse speed in pixels per second, same mapping as the original poll based generator
+        self.omega = np.abs(velocity / self.amplitude) * 0.01
+
+    def resume(self, now):
+        if self._clock is None:
+            self._clock = now
+
+    def pause(self):
+        self._clock = None
+
+    def reset(self):
+        self.pause()
+        self.omega = 0
+        self.phase = 0
+
+    def generate(self, now):
+        # every sample due between the last call and now, in one block
+        if self._clock is None:
+            return np.array([])
+        count = int((now - self._clock) * self.sample_rate)
+        if count <= 0:
+            return np.array([])
+        self._clock += count / self.sample_rate
+        phases = self.phase + self.omega / self.sample_rate * np.arange(1, count + 1)
+        self.phase = phases[-1] % (2 * np.pi)
+        return self.amplitude * np.cos(phases)